@@ -1,8 +1,11 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
+from functools import cached_property, lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
+    
     # AWS Configuration
     aws_access_key_id: Optional[str] = None
     aws_secret_access_key: Optional[str] = None
@@ -11,6 +14,7 @@ class Settings(BaseSettings):
     
     # S3 Configuration
     s3_bucket_name: str
+    max_upload_bytes: int = 50 * 1024 * 1024  # Requests declaring a larger body get 413
     
         # Amazon Bedrock Configuration
     bedrock_model_id: str = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
@@ -18,21 +22,38 @@ class Settings(BaseSettings):
     claude_37_sonnet_model_id: str = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
     claude_3_sonnet_model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0"
     nova_micro_model_id: str = "amazon.nova-micro-v1:0"
+    fast_model_id: str = "us.anthropic.claude-3-5-haiku-20241022-v1:0"  # Used by /care-plan/auto for simple prescriptions
     bedrock_region: str = "us-east-1"
+    bedrock_performance_mode: str = "optimized"  # Latency mode: "optimized" or "standard"; only applied to models that support it
+    care_plan_cache_ttl: int = 3600  # Seconds a generated care plan is reused for an identical prescription (0 disables)
+    care_plan_cache_size: int = 1024
     
     # Application Configuration
     app_name: str = "AI Health Service"
     app_version: str = "1.0.0"
     debug: bool = True
+    threadpool_size: int = 50  # Concurrent blocking AWS calls (matches max_pool_connections)
+    cors_origins: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
     
-    @property
+    @cached_property
     def effective_bedrock_region(self) -> str:
         """Get the effective Bedrock region (bedrock_region or aws_region)"""
         return self.bedrock_region or self.aws_region
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
 
 
-settings = Settings()
\ No newline at end of file
+@lru_cache()
+def get_settings() -> Settings:
+    """Get the process-wide settings instance (usable as a FastAPI dependency)"""
+    return Settings()
+
+
+settings = get_settings()
+
+# Hot-path values frozen once per process
+BEDROCK_MODEL_ID = settings.bedrock_model_id
+BEDROCK_REGION = settings.effective_bedrock_region
+S3_BUCKET = settings.s3_bucket_name
+MAX_UPLOAD_BYTES = settings.max_upload_bytes
+CLAUDE_37_SONNET_MODEL_ID = settings.claude_37_sonnet_model_id
+NOVA_MICRO_MODEL_ID = settings.nova_micro_model_id
+FAST_MODEL_ID = settings.fast_model_id
@@ -7,37 +7,168 @@ A comprehensive health service providing:
 - Bedrock access and permission diagnostics
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+import anyio.to_thread
+import atexit
+import boto3
 import logging
+import logging.handlers
+import orjson
+import queue
 
-from .config import settings
+from .config import settings, BEDROCK_MODEL_ID, BEDROCK_REGION, S3_BUCKET
+from .modules.file_upload import S3FileUploader
 from .routes import s3_routes, care_plan_routes, bedrock_routes, text_extraction_routes
 
-# Configure logging
+# Configure logging: handlers only enqueue records, a background thread does the writes
+log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+log_listener = logging.handlers.QueueListener(log_queue, log_stream_handler)
 logging.basicConfig(
     level=logging.INFO if settings.debug else logging.WARNING,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
+
+def create_aws_session() -> boto3.Session:
+    """
+    Build the boto3 session shared by the S3 and Bedrock clients, so the
+    credential chain, endpoint resolver and service models load only once.
+    """
+    return boto3.Session(
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        region_name=settings.aws_region
+    )
+
+
+def warm_up_s3(s3_uploader: S3FileUploader) -> None:
+    """
+    Open the S3 connection ahead of the first upload (best effort).
+    """
+    try:
+        s3_uploader.s3_client.head_bucket(Bucket=S3_BUCKET)
+    except Exception as e:
+        logger.warning("S3 warm-up skipped: %s", e)
+
+
+class ContentLengthLimitMiddleware:
+    """
+    Reject requests whose declared Content-Length exceeds the upload limit
+    before any of the body is read or spooled to disk.
+    """
+
+    def __init__(self, app, max_body_bytes: int):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_body_bytes:
+                        response = ORJSONResponse(
+                            status_code=413,
+                            content={"detail": f"Request body exceeds {self.max_body_bytes} bytes"}
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+class UnhandledErrorMiddleware:
+    """
+    Turn any exception a handler didn't convert to HTTPException into a 500,
+    so endpoints don't each need their own try/except wrapper.
+    
+    Unlike an exception handler for Exception, which Starlette's
+    ServerErrorMiddleware re-raises to the server afterwards, this logs each
+    error (with traceback) exactly once.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            if response_started:
+                # Too late to send an error response; the server logs it and drops the connection
+                raise
+            logger.error("Unhandled error on %s %s: %s", scope["method"], scope["path"], exc, exc_info=exc)
+            response = ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
+            await response(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the shared AWS clients once at startup so no request pays for
+    credential resolution, endpoint setup or the first TLS handshake.
+    """
+    # Blocking AWS calls run in the threadpool; size it to the botocore connection pools
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    app.state.aws_session = create_aws_session()
+    app.state.s3_uploader = s3_routes.create_s3_uploader(app.state.aws_session)
+    app.state.care_plan_generator = care_plan_routes.create_care_plan_generator(app.state.aws_session)
+    app.state.permission_clients = bedrock_routes.create_permission_clients(app.state.aws_session)
+    app.state.text_extractor = text_extraction_routes.create_text_extractor(app.state.aws_session)
+    await run_in_threadpool(warm_up_s3, app.state.s3_uploader)
+    yield
+
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="AI Health Service - S3 uploads and AI-powered care plan generation",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Innermost, so error responses still get CORS headers and compression
+app.add_middleware(UnhandledErrorMiddleware)
+
+# Reject oversize uploads before the body is read
+app.add_middleware(ContentLengthLimitMiddleware, max_body_bytes=settings.max_upload_bytes)
+
+# Compress larger JSON responses (care plans are several KB of repetitive text)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # Let browsers cache preflight results for a day
 )
 
 # Include routers
@@ -47,29 +178,60 @@ app.include_router(bedrock_routes.router)
 app.include_router(text_extraction_routes.router)
 
 
+# Static payloads serialized once at import; they only depend on settings
+ROOT_PAYLOAD_BYTES = orjson.dumps({
+    "message": f"Welcome to {settings.app_name}",
+    "version": settings.app_version,
+    "status": "healthy",
+    "features": [
+        "S3 file upload",
+        "AI care plan generation", 
+        "Multiple Claude models",
+        "Bedrock access diagnostics"
+    ],
+    "endpoints": {
+        "docs": "/docs",
+        "health": "/health",
+        "liveness": "/livez",
+        "s3_upload": "/upload",
+        "care_plans": "/care-plan",
+        "bedrock_diagnostics": "/bedrock"
+    }
+})
+
+HEALTH_PAYLOAD_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": settings.app_name,
+    "version": settings.app_version,
+    "configured_models": {
+        "claude_4_5_sonnet": BEDROCK_MODEL_ID,
+        "claude_3_7_sonnet": settings.claude_37_sonnet_model_id,
+        "claude_3_5_sonnet": settings.claude_35_sonnet_model_id,
+        "claude_3_sonnet": settings.claude_3_sonnet_model_id,
+        "nova_micro": settings.nova_micro_model_id
+    },
+    "aws_region": settings.aws_region,
+    "bedrock_region": BEDROCK_REGION
+})
+
+
+LIVEZ_RESPONSE_BODY = b"ok"
+
+
 @app.get("/")
 async def root():
     """
     Root endpoint.
     """
-    return {
-        "message": f"Welcome to {settings.app_name}",
-        "version": settings.app_version,
-        "status": "healthy",
-        "features": [
-            "S3 file upload",
-            "AI care plan generation", 
-            "Multiple Claude models",
-            "Bedrock access diagnostics"
-        ],
-        "endpoints": {
-            "docs": "/docs",
-            "health": "/health",
-            "s3_upload": "/upload",
-            "care_plans": "/care-plan",
-            "bedrock_diagnostics": "/bedrock"
-        }
-    }
+    return Response(content=ROOT_PAYLOAD_BYTES, media_type="application/json")
+
+
+@app.get("/livez", response_class=PlainTextResponse)
+async def liveness():
+    """
+    Liveness probe endpoint for load balancers and orchestrators.
+    """
+    return PlainTextResponse(content=LIVEZ_RESPONSE_BODY)
 
 
 @app.get("/health")
@@ -77,27 +239,18 @@ async def health_check():
     """
     Health check endpoint.
     """
-    return {
-        "status": "healthy",
-        "service": settings.app_name,
-        "version": settings.app_version,
-        "configured_models": {
-            "claude_4_5_sonnet": settings.bedrock_model_id,
-            "claude_3_7_sonnet": settings.claude_37_sonnet_model_id,
-            "claude_3_5_sonnet": settings.claude_35_sonnet_model_id,
-            "claude_3_sonnet": settings.claude_3_sonnet_model_id,
-            "nova_micro": settings.nova_micro_model_id
-        },
-        "aws_region": settings.aws_region,
-        "bedrock_region": settings.effective_bedrock_region
-    }
+    return Response(content=HEALTH_PAYLOAD_BYTES, media_type="application/json")
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.debug
+        reload=settings.debug,
+        # --reload and multiple workers are mutually exclusive
+        workers=None if settings.debug else (os.cpu_count() or 1),
+        access_log=settings.debug
     )
\ No newline at end of file
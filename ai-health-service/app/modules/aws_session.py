@@ -0,0 +1,92 @@
+"""
+AWS Session Module
+
+This module builds boto3 sessions shared by the service's long-lived AWS clients.
+"""
+
+import functools
+import boto3
+import botocore.session
+from botocore.credentials import (
+    AssumeRoleCredentialFetcher,
+    CredentialProvider,
+    CredentialResolver,
+    Credentials,
+    DeferredRefreshableCredentials,
+)
+from botocore.exceptions import NoCredentialsError
+from typing import Optional
+
+
+class AssumeRoleCredentialProvider(CredentialProvider):
+    """
+    Credential provider that assumes a fixed role with the given source credentials.
+
+    Credentials are fetched on first use and renewed by botocore shortly
+    before the STS token expires.
+    """
+
+    METHOD = "sts-assume-role"
+
+    def __init__(self, fetcher: AssumeRoleCredentialFetcher):
+        """
+        Initialize the provider.
+
+        Args:
+            fetcher: Fetcher that calls STS AssumeRole for the target role
+        """
+        self._fetcher = fetcher
+
+    def load(self) -> DeferredRefreshableCredentials:
+        """
+        Get refreshable credentials backed by the role fetcher.
+
+        Returns:
+            Credentials that call STS on first use and again before expiry
+        """
+        return DeferredRefreshableCredentials(
+            refresh_using=self._fetcher.fetch_credentials,
+            method=self.METHOD
+        )
+
+
+def assume_role_session(aws_role_arn: str,
+                        aws_access_key_id: Optional[str] = None,
+                        aws_secret_access_key: Optional[str] = None,
+                        region_name: str = "us-east-1",
+                        session_name: str = "BedrockCarePlanSession") -> boto3.Session:
+    """
+    Create a boto3 session backed by auto-refreshing assumed-role credentials
+
+    Args:
+        aws_role_arn: AWS role ARN to assume
+        aws_access_key_id: AWS access key ID used to call STS
+        aws_secret_access_key: AWS secret access key used to call STS
+        region_name: AWS region name
+        session_name: RoleSessionName recorded in CloudTrail
+
+    Returns:
+        boto3 session whose credentials are renewed shortly before expiry
+    """
+    source_session = botocore.session.get_session()
+    if aws_access_key_id and aws_secret_access_key:
+        source_credentials = Credentials(aws_access_key_id, aws_secret_access_key)
+    else:
+        # Default chain (environment, shared config, instance role, ...)
+        source_credentials = source_session.get_credentials()
+    if source_credentials is None:
+        raise NoCredentialsError()
+
+    fetcher = AssumeRoleCredentialFetcher(
+        client_creator=functools.partial(source_session.create_client, region_name=region_name),
+        source_credentials=source_credentials,
+        role_arn=aws_role_arn,
+        extra_args={"RoleSessionName": session_name}
+    )
+
+    botocore_session = botocore.session.get_session()
+    botocore_session.register_component(
+        "credential_provider",
+        CredentialResolver([AssumeRoleCredentialProvider(fetcher)])
+    )
+    return boto3.Session(botocore_session=botocore_session, region_name=region_name)
@@ -5,19 +5,294 @@ This module handles the generation of care plans from doctor prescriptions
 using Amazon Bedrock AI services.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import orjson
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 from datetime import datetime
+from enum import Enum
+from functools import lru_cache
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from pydantic import BaseModel, Field
+from fastapi import HTTPException
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+from .aws_session import assume_role_session
+from .cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Model listings and access checks change over hours, not per request
+BEDROCK_METADATA_TTL = 300
+# The foundation model catalog only changes when AWS releases models
+FOUNDATION_MODELS_TTL = 3600
+
+# Constant "Say 'Hello'" requests used by check_bedrock_access, serialized once
+NOVA_ACCESS_PROBE_BODY = orjson.dumps({
+    "messages": [{"role": "user", "content": [{"text": "Say 'Hello'"}]}],
+    "inferenceConfig": {"max_new_tokens": 10, "temperature": 0.1}
+})
+CLAUDE_ACCESS_PROBE_BODY = orjson.dumps({
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 10,
+    "messages": [{"role": "user", "content": "Say 'Hello'"}],
+    "temperature": 0.1
+})
+
+# Models probed by check_bedrock_access
+ACCESS_CHECK_MODEL_IDS = (
+    "anthropic.claude-3-haiku-20240307-v1:0",  # Standard model
+    "anthropic.claude-3-sonnet-20240229-v1:0",  # Standard model
+    "us.anthropic.claude-3-7-sonnet-20250219-v1:0",  # Latest standard inference profile
+    "us.anthropic.claude-3-5-sonnet-20241022-v2:0",  # Inference profile
+    "us.anthropic.claude-sonnet-4-5-20250929-v1:0",   # Premium inference profile
+    "amazon.nova-micro-v1:0"  # Amazon Nova Micro
+)
+
+# Models that support Bedrock latency-optimized inference; others must use standard latency.
+# None of the Sonnet models or Nova Micro is on it, so of the configured models only the
+# fast model (used by /care-plan/auto for simple prescriptions) runs latency-optimized.
+LATENCY_OPTIMIZED_MODEL_IDS = {
+    "us.anthropic.claude-3-5-haiku-20241022-v1:0",
+    "us.amazon.nova-pro-v1:0",
+    "us.meta.llama3-1-70b-instruct-v1:0",
+    "us.meta.llama3-1-405b-instruct-v1:0",
+}
+
+# Geography prefixes of cross-region inference profile ids, e.g. "us." in "us.amazon.nova-pro-v1:0"
+INFERENCE_PROFILE_PREFIXES = frozenset({"us", "us-gov", "eu", "apac", "ca", "jp", "au", "global"})
+
+# Claude models that accept cache_control breakpoints on Bedrock; older ones reject the field
+PROMPT_CACHING_MODEL_FAMILIES = (
+    "claude-3-5-haiku",
+    "claude-3-7-sonnet",
+    "claude-sonnet-4",
+    "claude-opus-4",
+    "claude-haiku-4",
+)
+
+# Output cap for care plan generation in every model format. Generation ends when the JSON
+# is complete, so the cap only bounds runaway output; lowering it risks truncated plans.
+CARE_PLAN_MAX_TOKENS = 4000
+
+# Stand-in for the patient section when pre-encoding request bodies; never appears in real prompts
+PROMPT_BODY_SENTINEL = "@@PATIENT_SECTION@@"
+
+# Long generations can exceed botocore's 60s default read timeout; adaptive retries back off on throttling.
+# TCP keepalive stops idle pooled connections being dropped by NAT/load balancers between calls.
+BEDROCK_CLIENT_CONFIG = Config(
+    connect_timeout=5,
+    read_timeout=300,
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"}
+)
+
+
+def _stream_chunk_text(payload: Dict[str, Any]) -> str:
+    """
+    Extract generated text from one decoded response-stream chunk
+    
+    Args:
+        payload: Decoded chunk from invoke_model_with_response_stream
+        
+    Returns:
+        Text delta carried by the chunk ("" for metadata/start/stop events)
+    """
+    if payload.get("type") == "content_block_delta":
+        # Claude messages API
+        return payload["delta"].get("text", "")
+    if "contentBlockDelta" in payload:
+        # Amazon Nova
+        return payload["contentBlockDelta"]["delta"].get("text", "")
+    # Amazon Titan
+    return payload.get("outputText", "")
+
+
+def _extract_json_object(content: str) -> str:
+    """
+    Slice the outermost JSON object out of model output
+    
+    Models sometimes wrap the JSON in a markdown fence or a sentence of
+    prose; cutting from the first "{" to the last "}" recovers it without
+    falling back to the generic care plan.
+    
+    Args:
+        content: Raw generated text
+        
+    Returns:
+        The text between the first "{" and last "}" inclusive, or the content unchanged
+    """
+    start = content.find("{")
+    end = content.rfind("}")
+    if 0 <= start < end:
+        return content[start:end + 1]
+    return content
+
+
+def _claude_system_prompt(model_id: str, instructions: str) -> Any:
+    """
+    Build the Claude system prompt, with a prompt-cache breakpoint where supported
+    
+    Args:
+        model_id: Bedrock model identifier
+        instructions: Static instructions and JSON schema
+        
+    Returns:
+        System prompt as cacheable content blocks, or a plain string for older models
+    """
+    if any(family in model_id for family in PROMPT_CACHING_MODEL_FAMILIES):
+        return [{"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}}]
+    return instructions
+
+
+def _build_claude_body(model_id: str, instructions: str, patient_section: str) -> Dict[str, Any]:
+    """Anthropic messages API request body; the static instructions go in the system prompt"""
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": CARE_PLAN_MAX_TOKENS,
+        "system": _claude_system_prompt(model_id, instructions),
+        "messages": [
+            {
+                "role": "user",
+                "content": [{"type": "text", "text": patient_section}]
+            }
+        ],
+        "temperature": 0.3,
+        "top_p": 0.9
+    }
+
+
+def _build_titan_body(model_id: str, instructions: str, patient_section: str) -> Dict[str, Any]:
+    """Amazon Titan text request body"""
+    return {
+        "inputText": instructions + patient_section,
+        "textGenerationConfig": {
+            "maxTokenCount": CARE_PLAN_MAX_TOKENS,
+            "temperature": 0.3,
+            "topP": 0.9
+        }
+    }
+
+
+def _build_nova_body(model_id: str, instructions: str, patient_section: str) -> Dict[str, Any]:
+    """Amazon Nova messages request body"""
+    return {
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "text": instructions + patient_section
+                    }
+                ]
+            }
+        ],
+        "inferenceConfig": {
+            "max_new_tokens": CARE_PLAN_MAX_TOKENS,
+            "temperature": 0.3,
+            "top_p": 0.9
+        }
+    }
+
+
+def _build_default_body(model_id: str, instructions: str, patient_section: str) -> Dict[str, Any]:
+    """Claude-style request body for unrecognized model families"""
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": CARE_PLAN_MAX_TOKENS,
+        "messages": [
+            {
+                "role": "user",
+                "content": instructions + patient_section
+            }
+        ],
+        "temperature": 0.3
+    }
+
+
+class ModelAdapter(NamedTuple):
+    """Request/response format of one Bedrock model family"""
+    name: str
+    build_body: Callable[[str, str, str], Dict[str, Any]]
+    extract_content: Callable[[Dict[str, Any]], str]
+
+
+MODEL_ADAPTERS = {
+    "anthropic.claude": ModelAdapter(
+        "Claude", _build_claude_body,
+        lambda response_body: response_body['content'][0]['text']
+    ),
+    "amazon.titan": ModelAdapter(
+        "Titan", _build_titan_body,
+        lambda response_body: response_body['results'][0]['outputText']
+    ),
+    "amazon.nova": ModelAdapter(
+        "Nova", _build_nova_body,
+        lambda response_body: response_body['output']['message']['content'][0]['text']
+    ),
+}
+
+DEFAULT_MODEL_ADAPTER = ModelAdapter(
+    "default Claude", _build_default_body,
+    lambda response_body: response_body.get('content', [{}])[0].get('text', '')
+)
+
+
+@lru_cache(maxsize=64)
+def model_family(model_id: str) -> str:
+    """
+    Reduce a model id, inference profile id or profile ARN to its family
+    
+    Args:
+        model_id: Bedrock model identifier, e.g. "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+            or "arn:aws:bedrock:us-east-1::foundation-model/amazon.nova-micro-v1:0"
+        
+    Returns:
+        Family key such as "anthropic.claude", or "" if the id has no provider part
+    """
+    # ARNs end in ".../<model or profile id>"
+    parts = model_id.rsplit("/", 1)[-1].split(".")
+    if len(parts) > 2 and parts[0] in INFERENCE_PROFILE_PREFIXES:
+        parts = parts[1:]
+    if len(parts) < 2:
+        return ""
+    return f"{parts[0]}.{parts[1].split('-', 1)[0]}"
+
+
+def supports_latency_optimized(model_id: str) -> bool:
+    """
+    Check whether a model accepts performanceConfigLatency="optimized"
+    
+    Args:
+        model_id: Bedrock model identifier, inference profile id or ARN
+        
+    Returns:
+        True if the model is on the latency-optimized allow-list
+    """
+    return model_id.rsplit("/", 1)[-1] in LATENCY_OPTIMIZED_MODEL_IDS
+
+
+def get_model_adapter(model_id: str) -> ModelAdapter:
+    """
+    Look up the request/response adapter for a model
+    
+    Args:
+        model_id: Bedrock model identifier
+        
+    Returns:
+        The family's adapter, or the default Claude-style adapter
+    """
+    return MODEL_ADAPTERS.get(model_family(model_id), DEFAULT_MODEL_ADAPTER)
+
 
 class PrescriptionItem(BaseModel):
     """Individual prescription item"""
+    model_config = ConfigDict(frozen=True)
+    
     medication_name: str = Field(..., description="Name of the medication")
     dosage: str = Field(..., description="Dosage amount and frequency")
     duration: str = Field(..., description="Duration of treatment")
@@ -26,6 +301,8 @@ class PrescriptionItem(BaseModel):
 
 class PatientInfo(BaseModel):
     """Patient information"""
+    model_config = ConfigDict(frozen=True)
+    
     age: int = Field(..., description="Patient age")
     gender: str = Field(..., description="Patient gender")
     weight: Optional[float] = Field(None, description="Patient weight in kg")
@@ -35,6 +312,8 @@ class PatientInfo(BaseModel):
 
 class DoctorPrescription(BaseModel):
     """Complete doctor prescription"""
+    model_config = ConfigDict(frozen=True)
+    
     patient_info: PatientInfo
     diagnosis: str = Field(..., description="Medical diagnosis")
     prescriptions: List[PrescriptionItem] = Field(..., description="List of prescribed medications")
@@ -42,11 +321,98 @@ class DoctorPrescription(BaseModel):
     prescription_date: Optional[str] = Field(default_factory=lambda: datetime.now().isoformat())
 
 
+def prescription_cache_key(prescription: DoctorPrescription, model_id: str) -> str:
+    """
+    Build an order-insensitive digest of a prescription for response caching
+    
+    Conditions, allergies and medications are sorted and the prescription
+    date is dropped, so re-submitting the same clinical content hits the cache.
+    
+    Args:
+        prescription: Doctor prescription data
+        model_id: Bedrock model identifier the plan was generated with
+        
+    Returns:
+        Hex digest identifying the prescription/model pair
+    """
+    patient = prescription.patient_info
+    canonical = {
+        "model_id": model_id,
+        "age": patient.age,
+        "gender": patient.gender.strip().lower(),
+        "weight": patient.weight,
+        "medical_conditions": sorted(c.strip().lower() for c in patient.medical_conditions or []),
+        "allergies": sorted(a.strip().lower() for a in patient.allergies or []),
+        "diagnosis": prescription.diagnosis.strip().lower(),
+        "prescriptions": sorted(
+            (item.medication_name.strip().lower(), item.dosage, item.duration, item.instructions or "")
+            for item in prescription.prescriptions
+        ),
+        "doctor_notes": prescription.doctor_notes or "",
+    }
+    return hashlib.blake2b(orjson.dumps(canonical), digest_size=16).hexdigest()
+
+
+def select_care_plan_model(prescription: DoctorPrescription, default_model_id: str,
+                           fast_model_id: str) -> str:
+    """
+    Pick a model by prescription complexity
+    
+    Prescriptions with at most two medications and no existing conditions go
+    to the faster model; everything else gets the default model.
+    
+    Args:
+        prescription: Doctor prescription data
+        default_model_id: Model for complex prescriptions
+        fast_model_id: Lower-latency model for simple prescriptions
+        
+    Returns:
+        Selected Bedrock model identifier
+    """
+    if len(prescription.prescriptions) <= 2 and not prescription.patient_info.medical_conditions:
+        return fast_model_id
+    return default_model_id
+
+
+class Priority(str, Enum):
+    """Priority level of a care plan section"""
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+# Other levels models use for a section; urgency words must never rank below high
+PRIORITY_ALIASES = {
+    "urgent": Priority.HIGH,
+    "critical": Priority.HIGH,
+    "severe": Priority.HIGH,
+    "emergency": Priority.HIGH,
+    "moderate": Priority.MEDIUM,
+}
+
+
 class CarePlanSection(BaseModel):
     """Individual section of a care plan"""
     title: str
     content: str
-    priority: str = Field(default="medium", description="Priority level: high, medium, low")
+    priority: Priority = Field(default=Priority.MEDIUM, description="Priority level: high, medium, low")
+
+    @field_validator("priority", mode="before")
+    @classmethod
+    def normalize_priority(cls, value: Any) -> Any:
+        """
+        Accept model output like "High" or "Critical"; unknown levels are kept at high
+        rather than silently downgraded.
+        """
+        if isinstance(value, str) and not isinstance(value, Priority):
+            level = value.strip().lower()
+            if level in Priority._value2member_map_:
+                return level
+            if level in PRIORITY_ALIASES:
+                return PRIORITY_ALIASES[level]
+            logger.warning("⚠️ Unknown care plan priority %r, treating it as high", value)
+            return Priority.HIGH
+        return value
 
 
 class CarePlan(BaseModel):
@@ -61,15 +427,159 @@ class CarePlan(BaseModel):
     generated_at: str = Field(default_factory=lambda: datetime.now().isoformat())
 
 
+class CarePlanResponse(BaseModel):
+    """API envelope for a single-model care plan"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    success: bool
+    message: str
+    care_plan: CarePlan
+    model_used: str
+    model_type: str
+    diagnosis: Optional[str] = None
+    sample_prescription: Optional[DoctorPrescription] = None
+    medical_factors_focus: Optional[Dict[str, Any]] = None
+
+
+class ModelCarePlanResult(BaseModel):
+    """Outcome of one care plan generation (per model in /compare, per prescription in /batch)"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    success: bool
+    model_used: str
+    care_plan: Optional[CarePlan] = None
+    error: Optional[str] = None
+
+
+class CarePlanComparisonResponse(BaseModel):
+    """API envelope for a multi-model care plan comparison"""
+    success: bool
+    message: str
+    diagnosis: str
+    successful_models: int
+    total_models: int
+    results: Dict[str, ModelCarePlanResult]
+    comparison_notes: Dict[str, str]
+
+
+class CarePlanBatchRequest(BaseModel):
+    """Prescriptions to generate care plans for in one batch"""
+    prescriptions: List[DoctorPrescription] = Field(..., min_length=1, max_length=8, description="Prescriptions to plan for")
+
+
+class CarePlanBatchResponse(BaseModel):
+    """API envelope for a batch of care plans, one result per prescription in order"""
+    model_config = ConfigDict(protected_namespaces=())
+    
+    success: bool
+    message: str
+    model_used: str
+    successful_plans: int
+    total_plans: int
+    results: List[ModelCarePlanResult]
+
+
 class BedrockCarePlanGenerator:
     """
     Amazon Bedrock integration for generating care plans from prescriptions
     """
     
+    # Static prompt text shared by every request, built once at class load
+    _PROMPT_PREFIX = """
+You are an experienced healthcare AI assistant. Based on the following doctor's prescription and patient information, create a comprehensive care plan.
+"""
+    
+    _PROMPT_SUFFIX = """
+
+Please provide a comprehensive care plan in JSON format with the following structure:
+{
+  "patient_summary": "Brief summary of patient condition and treatment approach",
+  "care_goals": ["Goal 1", "Goal 2", "Goal 3"],
+  "medication_management": [
+    {
+      "title": "Medication Schedule",
+      "content": "Detailed medication timing and administration instructions",
+      "priority": "high"
+    }
+  ],
+  "lifestyle_recommendations": [
+    {
+      "title": "Diet and Nutrition",
+      "content": "Specific dietary recommendations",
+      "priority": "medium"
+    }
+  ],
+  "monitoring_schedule": [
+    {
+      "title": "Vital Signs Monitoring",
+      "content": "What to monitor and how often",
+      "priority": "high"
+    }
+  ],
+  "warning_signs": ["Warning sign 1", "Warning sign 2"],
+  "follow_up_recommendations": [
+    {
+      "title": "Next Appointment",
+      "content": "When and why to schedule follow-up",
+      "priority": "high"
+    }
+  ]
+}
+
+Focus on:
+1. Medication safety and interactions
+2. Practical daily management
+3. Monitoring for side effects
+4. Lifestyle modifications specific to the condition
+5. Clear timeline for recovery/management
+
+Provide only the JSON response, no additional text.
+"""
+    
+    # Instructions and schema go first so they form a byte-identical prefix across requests
+    _PROMPT_INSTRUCTIONS = _PROMPT_PREFIX + _PROMPT_SUFFIX
+    
+    # Static parts of the fallback care plan used when a model response can't be parsed
+    _FALLBACK_CARE_GOALS = (
+        "Manage symptoms effectively",
+        "Monitor for medication side effects",
+        "Improve overall health outcomes"
+    )
+    _FALLBACK_LIFESTYLE_RECOMMENDATIONS = (
+        CarePlanSection(
+            title="General Health",
+            content="Maintain healthy diet, regular exercise as tolerated, and adequate rest.",
+            priority=Priority.MEDIUM
+        ),
+    )
+    _FALLBACK_MONITORING_SCHEDULE = (
+        CarePlanSection(
+            title="Regular Check-ups",
+            content="Schedule follow-up appointments as recommended by healthcare provider.",
+            priority=Priority.HIGH
+        ),
+    )
+    _FALLBACK_WARNING_SIGNS = (
+        "Worsening of symptoms",
+        "Unusual side effects",
+        "Signs of allergic reaction"
+    )
+    _FALLBACK_FOLLOW_UP_RECOMMENDATIONS = (
+        CarePlanSection(
+            title="Next Steps",
+            content="Contact healthcare provider if symptoms persist or worsen.",
+            priority=Priority.HIGH
+        ),
+    )
+    
     def __init__(self, aws_access_key_id: Optional[str] = None,
                  aws_secret_access_key: Optional[str] = None,
                  aws_role_arn: Optional[str] = None,
-                 region_name: str = "us-east-1"):
+                 region_name: str = "us-east-1",
+                 performance_config: Optional[Dict[str, str]] = None,
+                 session: Optional[boto3.Session] = None,
+                 care_plan_cache_ttl: int = 3600,
+                 care_plan_cache_size: int = 1024):
         """
         Initialize Bedrock client
         
@@ -78,34 +588,34 @@ class BedrockCarePlanGenerator:
             aws_secret_access_key: AWS secret access key
             aws_role_arn: AWS role ARN for role-based access
             region_name: AWS region name
+            performance_config: Bedrock performance config, e.g. {"latency": "optimized"}
+            session: Shared boto3 session to create the client from when no role is set
+            care_plan_cache_ttl: Seconds a generated care plan is reused for an identical prescription (0 disables)
+            care_plan_cache_size: Maximum number of cached care plans
         """
+        self.region_name = region_name
+        self.performance_config = performance_config or {}
+        self._metadata_cache = TTLCache(maxsize=8)
+        self.care_plan_cache_ttl = care_plan_cache_ttl
+        self._care_plan_cache = TTLCache(maxsize=care_plan_cache_size)
+        self._body_templates: Dict[str, Tuple[bytes, bytes]] = {}
+        
         try:
             if aws_role_arn:
-                # Use role-based access
-                sts_client = boto3.client('sts',
+                # Use role-based access; credentials refresh before the STS token expires
+                session = assume_role_session(
+                    aws_role_arn=aws_role_arn,
                     aws_access_key_id=aws_access_key_id,
                     aws_secret_access_key=aws_secret_access_key,
                     region_name=region_name
                 )
+                logger.info("Using role-based access with role: %s", aws_role_arn)
                 
-                assumed_role = sts_client.assume_role(
-                    RoleArn=aws_role_arn,
-                    RoleSessionName='BedrockCarePlanSession'
-                )
-                
-                credentials = assumed_role['Credentials']
-                self.bedrock_client = boto3.client(
-                    'bedrock-runtime',
-                    aws_access_key_id=credentials['AccessKeyId'],
-                    aws_secret_access_key=credentials['SecretAccessKey'],
-                    aws_session_token=credentials['SessionToken'],
-                    region_name=region_name
-                )
-                logger.info(f"Using role-based access with role: {aws_role_arn}")
+            elif session is not None:
+                logger.info("Using shared AWS session")
                 
             elif aws_access_key_id and aws_secret_access_key:
-                self.bedrock_client = boto3.client(
-                    'bedrock-runtime',
+                session = boto3.Session(
                     aws_access_key_id=aws_access_key_id,
                     aws_secret_access_key=aws_secret_access_key,
                     region_name=region_name
@@ -113,26 +623,98 @@ class BedrockCarePlanGenerator:
                 logger.info("Using access key-based authentication")
             else:
                 # Use default credentials
-                self.bedrock_client = boto3.client('bedrock-runtime', region_name=region_name)
+                session = boto3.Session(region_name=region_name)
                 logger.info("Using default AWS credentials")
+            
+            # All clients share one identity, so control-plane results can be cached per generator
+            self.bedrock_client = session.client('bedrock-runtime', region_name=region_name, config=BEDROCK_CLIENT_CONFIG)
+            self.bedrock_admin_client = session.client('bedrock', region_name=region_name, config=BEDROCK_CLIENT_CONFIG)
+            self.sts_client = session.client('sts', region_name=region_name, config=BEDROCK_CLIENT_CONFIG)
                 
         except Exception as e:
-            logger.error(f"Failed to initialize Bedrock client: {e}")
+            logger.error("Failed to initialize Bedrock client: %s", e)
             raise
     
-    def _create_prompt(self, prescription: DoctorPrescription) -> str:
+    def _performance_kwargs(self, model_id: str) -> Dict[str, str]:
+        """
+        Build the invoke_model performance arguments for a model
+        
+        Args:
+            model_id: Bedrock model identifier
+            
+        Returns:
+            Extra invoke_model kwargs (empty when the model only supports standard latency)
+        """
+        latency = self.performance_config.get("latency", "standard")
+        if latency == "standard" or not supports_latency_optimized(model_id):
+            return {}
+        return {"performanceConfigLatency": latency}
+    
+    def _invoke_model(self, model_id: str, body: bytes) -> Dict[str, Any]:
+        """
+        Call Bedrock invoke_model and read the full response (blocking)
+        
+        Args:
+            model_id: Bedrock model identifier
+            body: Encoded model-specific request body
+            
+        Returns:
+            Parsed response body
+        """
+        response = self.bedrock_client.invoke_model(
+            modelId=model_id,
+            body=body,
+            contentType='application/json',
+            accept='application/json',
+            **self._performance_kwargs(model_id)
+        )
+        
+        logger.debug("✅ Bedrock API call successful!")
+        logger.debug("📊 Response metadata: %s", response.get('ResponseMetadata', {}))
+        
+        return orjson.loads(response['body'].read())
+    
+    def _invoke_model_stream(self, model_id: str, body: bytes) -> Iterator[str]:
+        """
+        Call Bedrock invoke_model_with_response_stream and yield text as it is generated (blocking)
+        
+        Args:
+            model_id: Bedrock model identifier
+            body: Encoded model-specific request body
+            
+        Yields:
+            Generated text deltas
+        """
+        response = self.bedrock_client.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=body,
+            contentType='application/json',
+            accept='application/json',
+            **self._performance_kwargs(model_id)
+        )
+        
+        for event in response['body']:
+            chunk = event.get('chunk')
+            if chunk is None:
+                continue
+            text = _stream_chunk_text(orjson.loads(chunk['bytes']))
+            if text:
+                yield text
+    
+    def _create_prompt(self, prescription: DoctorPrescription) -> Tuple[str, str]:
         """
         Create a structured prompt for Bedrock to generate care plan
         
+        The prompt is split into the static instructions/JSON schema, which are
+        identical for every request, and the patient-specific section.
+        
         Args:
             prescription: Doctor prescription data
             
         Returns:
-            Formatted prompt string
+            Tuple of (static instructions, patient-specific section)
         """
         prompt = f"""
-You are an experienced healthcare AI assistant. Based on the following doctor's prescription and patient information, create a comprehensive care plan.
-
 PATIENT INFORMATION:
 - Age: {prescription.patient_info.age}
 - Gender: {prescription.patient_info.gender}
@@ -145,64 +727,102 @@ DIAGNOSIS: {prescription.diagnosis}
 PRESCRIBED MEDICATIONS:
 """
         
-        for i, med in enumerate(prescription.prescriptions, 1):
-            prompt += f"""
+        # Collect pieces and join once instead of growing the string per medication
+        parts = [prompt]
+        parts.extend(
+            f"""
 {i}. {med.medication_name}
    - Dosage: {med.dosage}
    - Duration: {med.duration}
    - Instructions: {med.instructions or 'Standard administration'}
 """
+            for i, med in enumerate(prescription.prescriptions, 1)
+        )
         
         if prescription.doctor_notes:
-            prompt += f"\nDOCTOR'S NOTES: {prescription.doctor_notes}"
+            parts.append(f"\nDOCTOR'S NOTES: {prescription.doctor_notes}")
         
-        prompt += """
-
-Please provide a comprehensive care plan in JSON format with the following structure:
-{
-  "patient_summary": "Brief summary of patient condition and treatment approach",
-  "care_goals": ["Goal 1", "Goal 2", "Goal 3"],
-  "medication_management": [
-    {
-      "title": "Medication Schedule",
-      "content": "Detailed medication timing and administration instructions",
-      "priority": "high"
-    }
-  ],
-  "lifestyle_recommendations": [
-    {
-      "title": "Diet and Nutrition",
-      "content": "Specific dietary recommendations",
-      "priority": "medium"
-    }
-  ],
-  "monitoring_schedule": [
-    {
-      "title": "Vital Signs Monitoring",
-      "content": "What to monitor and how often",
-      "priority": "high"
-    }
-  ],
-  "warning_signs": ["Warning sign 1", "Warning sign 2"],
-  "follow_up_recommendations": [
-    {
-      "title": "Next Appointment",
-      "content": "When and why to schedule follow-up",
-      "priority": "high"
-    }
-  ]
-}
-
-Focus on:
-1. Medication safety and interactions
-2. Practical daily management
-3. Monitoring for side effects
-4. Lifestyle modifications specific to the condition
-5. Clear timeline for recovery/management
-
-Provide only the JSON response, no additional text.
-"""
-        return prompt
+        return self._PROMPT_INSTRUCTIONS, "".join(parts)
+    
+    def _build_request_body(self, model_id: str, instructions: str,
+                            patient_section: str) -> Dict[str, Any]:
+        """
+        Build the model-specific invoke request body
+        
+        Args:
+            model_id: Bedrock model identifier
+            instructions: Static instructions and JSON schema
+            patient_section: Patient-specific prompt section
+            
+        Returns:
+            Request body for invoke_model / invoke_model_with_response_stream
+        """
+        adapter = get_model_adapter(model_id)
+        logger.debug("🤖 Using %s format", adapter.name)
+        return adapter.build_body(model_id, instructions, patient_section)
+    
+    def _encode_request_body(self, model_id: str, patient_section: str) -> bytes:
+        """
+        Encode the request body by splicing the patient section into a per-model byte template
+        
+        Everything except the patient section is constant for a model, so it is
+        serialized once and only the patient text is JSON-escaped per call.
+        
+        Args:
+            model_id: Bedrock model identifier
+            patient_section: Patient-specific prompt section
+            
+        Returns:
+            Encoded request body
+        """
+        template = self._body_templates.get(model_id)
+        if template is None:
+            body = self._build_request_body(model_id, self._PROMPT_INSTRUCTIONS, PROMPT_BODY_SENTINEL)
+            prefix, suffix = orjson.dumps(body).split(PROMPT_BODY_SENTINEL.encode())
+            template = self._body_templates[model_id] = (prefix, suffix)
+        
+        prefix, suffix = template
+        # orjson.dumps of a str is the quoted, escaped JSON string; drop the quotes
+        return prefix + orjson.dumps(patient_section)[1:-1] + suffix
+    
+    def bedrock_http_error(self, error: ClientError, model_id: str) -> HTTPException:
+        """
+        Log a Bedrock ClientError and map it to the HTTP error returned to the client
+        
+        Args:
+            error: Error raised by a Bedrock runtime call
+            model_id: Bedrock model identifier that was called
+            
+        Returns:
+            403 for access denied, 502 for request validation and other Bedrock errors
+        """
+        error_code = error.response['Error']['Code']
+        error_message = error.response['Error']['Message']
+        
+        # DETAILED ERROR LOGGING
+        logger.error("❌ === BEDROCK CLIENT ERROR DETAILS ===")
+        logger.error("🚫 Error Code: %s", error_code)
+        logger.error("💬 Error Message: %s", error_message)
+        logger.error("🎯 Model ID Used: %s", model_id)
+        logger.error("🌍 Region: %s", self.region_name)
+        logger.error("📦 Request Details: %s", error.response)
+        
+        if error_code == 'AccessDeniedException':
+            logger.error("🔒 ACCESS DENIED - Possible causes:")
+            logger.error("   1. Model access not requested in Bedrock console")
+            logger.error("   2. Payment method required for premium models")
+            logger.error("   3. IAM permissions insufficient")
+            logger.error("   4. Model not available in region")
+            return HTTPException(status_code=403, detail="Access denied to Amazon Bedrock. Check IAM permissions.")
+        elif error_code == 'ValidationException':
+            logger.error("⚠️  VALIDATION ERROR - Possible causes:")
+            logger.error("   1. Incorrect model ID format")
+            logger.error("   2. Invalid request parameters")
+            logger.error("   3. Model requires different API format")
+            return HTTPException(status_code=502, detail="Invalid request to Bedrock. Check model ID and parameters.")
+        else:
+            logger.error("🔥 OTHER ERROR: %s", error_code)
+            return HTTPException(status_code=502, detail=f"Bedrock error: {error_code}")
     
     async def generate_care_plan(self, prescription: DoctorPrescription, 
                                 model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0") -> CarePlan:
@@ -216,162 +836,100 @@ Provide only the JSON response, no additional text.
         Returns:
             Generated care plan
         """
-        # ADD COMPREHENSIVE DEBUG LOGGING
-        logger.info("=== BEDROCK CARE PLAN GENERATION DEBUG ===")
-        logger.info(f"🎯 Model ID: {model_id}")
-        logger.info(f"🏥 Diagnosis: {prescription.diagnosis}")
-        logger.info(f"👤 Patient Age: {prescription.patient_info.age}")
-        logger.info(f"🔑 AWS Region: {self.bedrock_client._client_config.region_name}")
+        logger.debug("=== BEDROCK CARE PLAN GENERATION DEBUG ===")
+        logger.debug("🎯 Model ID: %s", model_id)
+        logger.debug("🏥 Diagnosis: %s", prescription.diagnosis)
+        logger.debug("👤 Patient Age: %s", prescription.patient_info.age)
+        logger.debug("🔑 AWS Region: %s", self.region_name)
+        
+        cache_key = prescription_cache_key(prescription, model_id) if self.care_plan_cache_ttl > 0 else None
+        if cache_key is not None:
+            cached_plan = self._care_plan_cache.get(cache_key)
+            if cached_plan is not None:
+                logger.info("♻️ Care plan cache hit for diagnosis: %s", prescription.diagnosis)
+                return cached_plan
         
         try:
-            prompt = self._create_prompt(prescription)
-            logger.info(f"📝 Prompt length: {len(prompt)} characters")
-            
-            # Prepare request body based on model type
-            if "anthropic.claude" in model_id:
-                body = {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 4000,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,
-                    "top_p": 0.9
-                }
-                logger.info("🤖 Using Claude format")
-            elif "amazon.titan" in model_id:
-                body = {
-                    "inputText": prompt,
-                    "textGenerationConfig": {
-                        "maxTokenCount": 4000,
-                        "temperature": 0.3,
-                        "topP": 0.9
-                    }
-                }
-                logger.info("🤖 Using Titan format")
-            elif "amazon.nova" in model_id:
-                body = {
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "text": prompt
-                                }
-                            ]
-                        }
-                    ],
-                    "inferenceConfig": {
-                        "max_new_tokens": 4000,
-                        "temperature": 0.3,
-                        "top_p": 0.9
-                    }
-                }
-                logger.info("🤖 Using Nova format")
-            else:
-                # Default to Claude format
-                body = {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 4000,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3
-                }
-                logger.info("🤖 Using default Claude format")
-            
-            logger.info(f"📦 Request body keys: {list(body.keys())}")
-            logger.info(f"📏 Request body size: {len(json.dumps(body))} bytes")
-            
-            # Call Bedrock
-            logger.info("🚀 Calling Bedrock API...")
-            response = self.bedrock_client.invoke_model(
-                modelId=model_id,
-                body=json.dumps(body),
-                contentType='application/json',
-                accept='application/json'
-            )
+            instructions, patient_section = self._create_prompt(prescription)
+            logger.debug("📝 Prompt length: %s characters", len(instructions) + len(patient_section))
             
-            logger.info("✅ Bedrock API call successful!")
-            logger.info(f"📊 Response metadata: {response.get('ResponseMetadata', {})}")
+            body = self._encode_request_body(model_id, patient_section)
+            logger.debug("📏 Request body size: %s bytes", len(body))
             
-            # Parse response
-            response_body = json.loads(response['body'].read())
-            logger.info(f"📋 Response body keys: {list(response_body.keys())}")
+            # Call Bedrock in a worker thread so the event loop keeps serving other requests
+            logger.debug("🚀 Calling Bedrock API...")
+            response_body = await run_in_threadpool(self._invoke_model, model_id, body)
+            logger.debug("📋 Response body keys: %s", list(response_body.keys()))
+            usage = response_body.get("usage")
+            if usage:
+                logger.debug("🧮 Token usage: %s", usage)
+                if "cache_read_input_tokens" in usage:
+                    logger.info(
+                        "🧊 Prompt cache: %s tokens read, %s tokens written",
+                        usage.get("cache_read_input_tokens", 0),
+                        usage.get("cache_creation_input_tokens", 0)
+                    )
             
-            # Extract content based on model type
-            if "anthropic.claude" in model_id:
-                content = response_body['content'][0]['text']
-            elif "amazon.titan" in model_id:
-                content = response_body['results'][0]['outputText']
-            elif "amazon.nova" in model_id:
-                content = response_body['output']['message']['content'][0]['text']
-            else:
-                content = response_body.get('content', [{}])[0].get('text', '')
+            content = get_model_adapter(model_id).extract_content(response_body)
             
-            logger.info(f"📝 Generated content length: {len(content)} characters")
+            logger.debug("📝 Generated content length: %s characters", len(content))
             
             # Parse JSON response
             try:
-                care_plan_data = json.loads(content.strip())
-                care_plan = CarePlan(**care_plan_data)
+                # Parse and validate in one pass, without building an intermediate dict
+                care_plan = CarePlan.model_validate_json(_extract_json_object(content))
                 
-                logger.info(f"✅ Successfully generated care plan for diagnosis: {prescription.diagnosis}")
+                logger.info("✅ Successfully generated care plan for diagnosis: %s", prescription.diagnosis)
+                # Only parsed plans are cached; fallback plans should be retried next time
+                if cache_key is not None:
+                    self._care_plan_cache.set(cache_key, care_plan, ttl=self.care_plan_cache_ttl)
                 return care_plan
                 
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ Failed to parse Bedrock response as JSON: {e}")
-                logger.error(f"📄 Raw content preview: {content[:200]}...")
+            except ValidationError as e:
+                # Well-formed JSON with the wrong shape is still an error; only unparseable text falls back
+                if e.errors()[0]["type"] != "json_invalid":
+                    raise
+                logger.error("❌ Failed to parse Bedrock response as JSON: %s", e)
+                logger.error("📄 Raw content preview: %s...", content[:200])
                 # Fallback: create basic care plan
                 return self._create_fallback_care_plan(prescription, content)
                 
         except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
-            
-            # DETAILED ERROR LOGGING
-            logger.error("❌ === BEDROCK CLIENT ERROR DETAILS ===")
-            logger.error(f"🚫 Error Code: {error_code}")
-            logger.error(f"💬 Error Message: {error_message}")
-            logger.error(f"🎯 Model ID Used: {model_id}")
-            logger.error(f"🌍 Region: {self.bedrock_client._client_config.region_name}")
-            logger.error(f"📦 Request Details: {e.response}")
-            
-            if error_code == 'AccessDeniedException':
-                logger.error("🔒 ACCESS DENIED - Possible causes:")
-                logger.error("   1. Model access not requested in Bedrock console")
-                logger.error("   2. Payment method required for premium models")
-                logger.error("   3. IAM permissions insufficient")
-                logger.error("   4. Model not available in region")
-                raise Exception("Access denied to Amazon Bedrock. Check IAM permissions.")
-            elif error_code == 'ValidationException':
-                logger.error("⚠️  VALIDATION ERROR - Possible causes:")
-                logger.error("   1. Incorrect model ID format")
-                logger.error("   2. Invalid request parameters")
-                logger.error("   3. Model requires different API format")
-                raise Exception("Invalid request to Bedrock. Check model ID and parameters.")
-            else:
-                logger.error(f"🔥 OTHER ERROR: {error_code}")
-                raise Exception(f"Bedrock error: {error_code}")
-                
-        except Exception as e:
-            logger.error("💥 === UNEXPECTED ERROR ===")
-            logger.error(f"❌ Error Type: {type(e).__name__}")
-            logger.error(f"💬 Error Message: {str(e)}")
-            logger.error(f"🎯 Model ID: {model_id}")
-            import traceback
-            logger.error(f"📚 Traceback: {traceback.format_exc()}")
-            raise Exception(f"Unexpected error in care plan generation: {str(e)}")
+            raise self.bedrock_http_error(e, model_id)
                 
         except Exception as e:
-            logger.error(f"Unexpected error generating care plan: {str(e)}")
-            raise Exception(f"Failed to generate care plan: {str(e)}")
+            logger.exception("💥 Unexpected error in care plan generation with model %s", model_id)
+            raise HTTPException(status_code=500, detail=f"Failed to generate care plan: {str(e)}")
+    
+    async def stream_care_plan(self, prescription: DoctorPrescription,
+                               model_id: str = "anthropic.claude-3-sonnet-20240229-v1:0") -> AsyncIterator[str]:
+        """
+        Stream the care plan JSON text from Amazon Bedrock as it is generated
+        
+        The first bytes reach the caller after the model's first token instead
+        of after the whole generation. A cached plan for the same prescription
+        is returned in one piece.
+        
+        Args:
+            prescription: Doctor prescription data
+            model_id: Bedrock model identifier
+            
+        Yields:
+            Chunks of the care plan JSON text
+        """
+        if self.care_plan_cache_ttl > 0:
+            cached_plan = self._care_plan_cache.get(prescription_cache_key(prescription, model_id))
+            if cached_plan is not None:
+                logger.info("♻️ Care plan cache hit for diagnosis: %s", prescription.diagnosis)
+                yield cached_plan.model_dump_json()
+                return
+        
+        _, patient_section = self._create_prompt(prescription)
+        body = self._encode_request_body(model_id, patient_section)
+        
+        logger.info("🚀 Streaming from Bedrock API with model: %s", model_id)
+        async for text in iterate_in_threadpool(self._invoke_model_stream(model_id, body)):
+            yield text
     
     def _create_fallback_care_plan(self, prescription: DoctorPrescription, raw_content: str) -> CarePlan:
         """
@@ -384,48 +942,39 @@ Provide only the JSON response, no additional text.
         Returns:
             Basic care plan
         """
-        return CarePlan(
+        # Only the summary and medication line vary; the rest is copied from prevalidated
+        # constants so a caller mutating one plan can't change later fallback plans
+        return CarePlan.model_construct(
             patient_summary=f"Patient with {prescription.diagnosis} requiring medication management and monitoring.",
-            care_goals=[
-                "Manage symptoms effectively",
-                "Monitor for medication side effects",
-                "Improve overall health outcomes"
-            ],
+            care_goals=list(self._FALLBACK_CARE_GOALS),
             medication_management=[
-                CarePlanSection(
+                CarePlanSection.model_construct(
                     title="Prescribed Medications",
                     content=f"Follow prescribed regimen for {len(prescription.prescriptions)} medication(s). Take as directed by physician.",
-                    priority="high"
+                    priority=Priority.HIGH
                 )
             ],
-            lifestyle_recommendations=[
-                CarePlanSection(
-                    title="General Health",
-                    content="Maintain healthy diet, regular exercise as tolerated, and adequate rest.",
-                    priority="medium"
-                )
-            ],
-            monitoring_schedule=[
-                CarePlanSection(
-                    title="Regular Check-ups",
-                    content="Schedule follow-up appointments as recommended by healthcare provider.",
-                    priority="high"
-                )
-            ],
-            warning_signs=[
-                "Worsening of symptoms",
-                "Unusual side effects",
-                "Signs of allergic reaction"
-            ],
-            follow_up_recommendations=[
-                CarePlanSection(
-                    title="Next Steps",
-                    content="Contact healthcare provider if symptoms persist or worsen.",
-                    priority="high"
-                )
-            ]
+            lifestyle_recommendations=[section.model_copy() for section in self._FALLBACK_LIFESTYLE_RECOMMENDATIONS],
+            monitoring_schedule=[section.model_copy() for section in self._FALLBACK_MONITORING_SCHEDULE],
+            warning_signs=list(self._FALLBACK_WARNING_SIGNS),
+            follow_up_recommendations=[section.model_copy() for section in self._FALLBACK_FOLLOW_UP_RECOMMENDATIONS]
         )
     
+    def _list_foundation_models(self) -> List[Dict[str, Any]]:
+        """
+        Get the region's foundation model summaries, cached for FOUNDATION_MODELS_TTL
+        
+        Returns:
+            modelSummaries from ListFoundationModels
+        """
+        cached_summaries = self._metadata_cache.get("foundation_models")
+        if cached_summaries is not None:
+            return cached_summaries
+        
+        model_summaries = self.bedrock_admin_client.list_foundation_models().get('modelSummaries', [])
+        self._metadata_cache.set("foundation_models", model_summaries, ttl=FOUNDATION_MODELS_TTL)
+        return model_summaries
+    
     def list_available_models(self) -> List[str]:
         """
         List available Bedrock models for care plan generation
@@ -433,20 +982,22 @@ Provide only the JSON response, no additional text.
         Returns:
             List of available model IDs
         """
+        cached_models = self._metadata_cache.get("available_models")
+        if cached_models is not None:
+            return cached_models
+        
         try:
-            bedrock_client = boto3.client('bedrock', region_name=self.bedrock_client._client_config.region_name)
-            response = bedrock_client.list_foundation_models()
-            
             # Filter for text generation models suitable for care plans
-            suitable_models = []
-            for model in response.get('modelSummaries', []):
-                if 'TEXT' in model.get('outputModalities', []):
-                    suitable_models.append(model['modelId'])
+            suitable_models = [
+                model['modelId'] for model in self._list_foundation_models()
+                if 'TEXT' in model.get('outputModalities', [])
+            ]
             
+            self._metadata_cache.set("available_models", suitable_models, ttl=FOUNDATION_MODELS_TTL)
             return suitable_models
             
         except Exception as e:
-            logger.error(f"Failed to list Bedrock models: {e}")
+            logger.error("Failed to list Bedrock models: %s", e)
             # Return common model IDs as fallback including latest Claude models and Nova
             return [
                 "anthropic.claude-sonnet-4-5-20250929-v1:0",
@@ -457,13 +1008,129 @@ Provide only the JSON response, no additional text.
                 "amazon.nova-micro-v1:0"
             ]
 
-    def check_bedrock_access(self) -> Dict[str, Any]:
+    def _check_list_models(self) -> Dict[str, Any]:
+        """
+        Check the ListFoundationModels permission (blocking)
+        
+        Returns:
+            Check result dictionary
+        """
+        try:
+            model_summaries = self._list_foundation_models()
+            model_count = len(model_summaries)
+            logger.info("✅ Listed %s foundation models", model_count)
+            
+            return {
+                "status": "success",
+                "model_count": model_count,
+                "message": f"Successfully listed {model_count} foundation models",
+                "available_models": [model['modelId'] for model in model_summaries]
+            }
+            
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            logger.error("❌ Failed to list models: %s", error_code)
+            return {
+                "status": "error",
+                "error_code": error_code,
+                "message": f"Failed to list models: {e.response['Error']['Message']}"
+            }
+    
+    def _probe_model(self, model_id: str) -> Dict[str, Any]:
+        """
+        Check access to one model with a tiny invocation (blocking)
+        
+        Args:
+            model_id: Bedrock model identifier
+            
+        Returns:
+            Check result dictionary
+        """
+        try:
+            logger.info("🧪 Testing model access: %s", model_id)
+            
+            response = self.bedrock_client.invoke_model(
+                modelId=model_id,
+                body=NOVA_ACCESS_PROBE_BODY if model_family(model_id) == "amazon.nova" else CLAUDE_ACCESS_PROBE_BODY,
+                contentType='application/json',
+                accept='application/json'
+            )
+            
+            # Parse response to verify it works
+            response_body = orjson.loads(response['body'].read())
+            
+            # Extract content based on model type
+            if model_family(model_id) == "amazon.nova":
+                content = response_body.get('output', {}).get('message', {}).get('content', [{}])[0].get('text', '')
+            else:
+                content = response_body.get('content', [{}])[0].get('text', '')
+            
+            logger.info("✅ Model %s accessible", model_id)
+            return {
+                "status": "success",
+                "response_length": len(content),
+                "message": "Model accessible and responding",
+                "sample_response": content[:50] + "..." if len(content) > 50 else content
+            }
+            
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            error_message = e.response['Error']['Message']
+            logger.error("❌ Model %s access failed: %s", model_id, error_code)
+            return {
+                "status": "error",
+                "error_code": error_code,
+                "message": error_message,
+                "details": self._analyze_model_error(error_code, error_message, model_id)
+            }
+        
+        except Exception as e:
+            logger.error("❌ Unexpected error testing %s: %s", model_id, e)
+            return {
+                "status": "error",
+                "message": f"Unexpected error: {str(e)}"
+            }
+    
+    def _check_identity(self) -> Dict[str, Any]:
+        """
+        Check the AWS caller identity (blocking)
+        
+        Returns:
+            Check result dictionary
+        """
+        try:
+            identity = self.sts_client.get_caller_identity()
+            logger.info("✅ AWS Identity: %s", identity.get('Arn'))
+            
+            return {
+                "status": "success",
+                "account": identity.get('Account'),
+                "user_id": identity.get('UserId'),
+                "arn": identity.get('Arn'),
+                "message": "AWS identity retrieved successfully"
+            }
+            
+        except Exception as e:
+            logger.error("❌ Failed to get AWS identity: %s", e)
+            return {
+                "status": "error",
+                "message": f"Failed to get AWS identity: {str(e)}"
+            }
+    
+    async def check_bedrock_access(self) -> Dict[str, Any]:
         """
         Check AWS Bedrock access and IAM permissions
         
+        The model listing, every model probe and the identity lookup are
+        independent, so they run concurrently in the threadpool.
+        
         Returns:
             Dictionary with access check results
         """
+        cached_results = self._metadata_cache.get("access_check")
+        if cached_results is not None:
+            return cached_results
+        
         results = {
             "timestamp": datetime.now().isoformat(),
             "overall_access": False,
@@ -474,183 +1141,50 @@ Provide only the JSON response, no additional text.
             # Check 1: Basic bedrock client connection
             logger.info("🔍 === BEDROCK ACCESS CHECK ===")
             
-            try:
-                region = self.bedrock_client._client_config.region_name
-                results["checks"]["bedrock_client"] = {
-                    "status": "success",
-                    "region": region,
-                    "message": "Bedrock runtime client initialized successfully"
-                }
-                logger.info(f"✅ Bedrock client initialized in region: {region}")
-            except Exception as e:
-                results["checks"]["bedrock_client"] = {
-                    "status": "error",
-                    "message": f"Failed to initialize Bedrock client: {str(e)}"
-                }
-                logger.error(f"❌ Bedrock client initialization failed: {e}")
-                return results
-            
-            # Check 2: List foundation models permission
-            try:
-                bedrock_admin_client = boto3.client('bedrock', region_name=region)
-                response = bedrock_admin_client.list_foundation_models()
-                model_count = len(response.get('modelSummaries', []))
-                
-                results["checks"]["list_models"] = {
-                    "status": "success",
-                    "model_count": model_count,
-                    "message": f"Successfully listed {model_count} foundation models"
-                }
-                logger.info(f"✅ Listed {model_count} foundation models")
-                
-                # Extract available models
-                available_models = [model['modelId'] for model in response.get('modelSummaries', [])]
-                results["checks"]["list_models"]["available_models"] = available_models
-                
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
-                results["checks"]["list_models"] = {
-                    "status": "error",
-                    "error_code": error_code,
-                    "message": f"Failed to list models: {e.response['Error']['Message']}"
-                }
-                logger.error(f"❌ Failed to list models: {error_code}")
-            
-            # Check 3: Test basic model invocation with simple prompt
-            test_models = [
-                "anthropic.claude-3-haiku-20240307-v1:0",  # Standard model
-                "anthropic.claude-3-sonnet-20240229-v1:0",  # Standard model
-                "us.anthropic.claude-3-7-sonnet-20250219-v1:0",  # Latest standard inference profile
-                "us.anthropic.claude-3-5-sonnet-20241022-v2:0",  # Inference profile
-                "us.anthropic.claude-sonnet-4-5-20250929-v1:0",   # Premium inference profile
-                "amazon.nova-micro-v1:0"  # Amazon Nova Micro
-            ]
-            
-            results["checks"]["model_access"] = {}
-            
-            for model_id in test_models:
-                try:
-                    logger.info(f"🧪 Testing model access: {model_id}")
-                    
-                    # Prepare test body based on model type
-                    if "amazon.nova" in model_id:
-                        test_body = {
-                            "messages": [
-                                {
-                                    "role": "user",
-                                    "content": [
-                                        {
-                                            "text": "Say 'Hello'"
-                                        }
-                                    ]
-                                }
-                            ],
-                            "inferenceConfig": {
-                                "max_new_tokens": 10,
-                                "temperature": 0.1
-                            }
-                        }
-                    else:
-                        # Claude format
-                        test_body = {
-                            "anthropic_version": "bedrock-2023-05-31",
-                            "max_tokens": 10,
-                            "messages": [
-                                {
-                                    "role": "user",
-                                    "content": "Say 'Hello'"
-                                }
-                            ],
-                            "temperature": 0.1
-                        }
-                    
-                    response = self.bedrock_client.invoke_model(
-                        modelId=model_id,
-                        body=json.dumps(test_body),
-                        contentType='application/json',
-                        accept='application/json'
-                    )
-                    
-                    # Parse response to verify it works
-                    response_body = json.loads(response['body'].read())
-                    
-                    # Extract content based on model type
-                    if "amazon.nova" in model_id:
-                        content = response_body.get('output', {}).get('message', {}).get('content', [{}])[0].get('text', '')
-                    else:
-                        content = response_body.get('content', [{}])[0].get('text', '')
-                    
-                    results["checks"]["model_access"][model_id] = {
-                        "status": "success",
-                        "response_length": len(content),
-                        "message": "Model accessible and responding",
-                        "sample_response": content[:50] + "..." if len(content) > 50 else content
-                    }
-                    logger.info(f"✅ Model {model_id} accessible")
-                    
-                except ClientError as e:
-                    error_code = e.response['Error']['Code']
-                    error_message = e.response['Error']['Message']
-                    
-                    results["checks"]["model_access"][model_id] = {
-                        "status": "error",
-                        "error_code": error_code,
-                        "message": error_message,
-                        "details": self._analyze_model_error(error_code, error_message, model_id)
-                    }
-                    logger.error(f"❌ Model {model_id} access failed: {error_code}")
-                
-                except Exception as e:
-                    results["checks"]["model_access"][model_id] = {
-                        "status": "error",
-                        "message": f"Unexpected error: {str(e)}"
-                    }
-                    logger.error(f"❌ Unexpected error testing {model_id}: {e}")
+            results["checks"]["bedrock_client"] = {
+                "status": "success",
+                "region": self.region_name,
+                "message": "Bedrock runtime client initialized successfully"
+            }
+            logger.info("✅ Bedrock client initialized in region: %s", self.region_name)
             
-            # Check 4: AWS credentials information
-            try:
-                sts_client = boto3.client('sts', region_name=region)
-                identity = sts_client.get_caller_identity()
-                
-                results["checks"]["aws_identity"] = {
-                    "status": "success",
-                    "account": identity.get('Account'),
-                    "user_id": identity.get('UserId'),
-                    "arn": identity.get('Arn'),
-                    "message": "AWS identity retrieved successfully"
-                }
-                logger.info(f"✅ AWS Identity: {identity.get('Arn')}")
-                
-            except Exception as e:
-                results["checks"]["aws_identity"] = {
-                    "status": "error",
-                    "message": f"Failed to get AWS identity: {str(e)}"
-                }
-                logger.error(f"❌ Failed to get AWS identity: {e}")
+            # Checks 2-4: list models, test each model, AWS identity
+            list_models, identity, *model_results = await asyncio.gather(
+                run_in_threadpool(self._check_list_models),
+                run_in_threadpool(self._check_identity),
+                *(run_in_threadpool(self._probe_model, model_id) for model_id in ACCESS_CHECK_MODEL_IDS)
+            )
+            results["checks"]["list_models"] = list_models
+            results["checks"]["model_access"] = dict(zip(ACCESS_CHECK_MODEL_IDS, model_results))
+            results["checks"]["aws_identity"] = identity
             
             # Determine overall access status
             successful_models = [
-                model for model, result in results["checks"].get("model_access", {}).items()
+                model for model, result in results["checks"]["model_access"].items()
                 if result["status"] == "success"
             ]
             
             results["overall_access"] = len(successful_models) > 0
             results["summary"] = {
                 "accessible_models": len(successful_models),
-                "total_models_tested": len(test_models),
-                "has_basic_access": results["checks"].get("bedrock_client", {}).get("status") == "success",
-                "can_list_models": results["checks"].get("list_models", {}).get("status") == "success"
+                "total_models_tested": len(ACCESS_CHECK_MODEL_IDS),
+                "has_basic_access": True,
+                "can_list_models": list_models["status"] == "success"
             }
             
-            logger.info(f"🎯 Access check complete. Overall access: {results['overall_access']}")
+            logger.info("🎯 Access check complete. Overall access: %s", results['overall_access'])
             
         except Exception as e:
-            logger.error(f"💥 Access check failed with unexpected error: {e}")
+            logger.error("💥 Access check failed with unexpected error: %s", e)
             results["checks"]["unexpected_error"] = {
                 "status": "error",
                 "message": f"Unexpected error during access check: {str(e)}"
             }
         
+        # Only successful checks are cached so a fixed permission shows up on the next call
+        if results["overall_access"]:
+            self._metadata_cache.set("access_check", results, ttl=BEDROCK_METADATA_TTL)
+        
         return results
     
     def _analyze_model_error(self, error_code: str, error_message: str, model_id: str) -> Dict[str, str]:
@@ -1,14 +1,81 @@
 import boto3
-import uuid
 import os
+import secrets
+import time
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from botocore.config import Config
+from botocore.credentials import Credentials, RefreshableCredentials
 from botocore.exceptions import ClientError, NoCredentialsError
 import logging
 
+from .cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# PDF files always start with this header
+PDF_MAGIC_BYTES = b"%PDF-"
+
+# Stream uploads in 8 MB parts: memory stays bounded and large files upload parts in parallel
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
+# Pool sized for several concurrent multipart uploads (max_concurrency parts each);
+# SigV4 pinned so presigned URLs are signed the same way in every region
+S3_CLIENT_CONFIG = Config(
+    signature_version="s3v4",
+    connect_timeout=5,
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"}
+)
+
+# Cached presigned URLs are dropped this long before the URL itself expires
+PRESIGNED_URL_EXPIRY_MARGIN = 300
+
+
+def presigned_url_min_validity(expiration: int) -> int:
+    """
+    Seconds any URL returned by get_file_url is still valid for, at minimum.
+    
+    Args:
+        expiration: URL expiration time in seconds
+        
+    Returns:
+        The cache safety margin for that expiration
+    """
+    return min(PRESIGNED_URL_EXPIRY_MARGIN, expiration // 2)
+
+
+def is_long_term_credentials(credentials: Optional[Credentials]) -> bool:
+    """
+    Check whether credentials are long-term access keys (no session token).
+    
+    Args:
+        credentials: Credentials resolved by the boto3 session, if any
+        
+    Returns:
+        True for static keys; False for refreshable or session-token credentials
+    """
+    if credentials is None or isinstance(credentials, RefreshableCredentials):
+        return False
+    return credentials.token is None
+
+
+class PresignedUrlBatchRequest(BaseModel):
+    """Keys to sign in one presigned URL batch"""
+    keys: List[str] = Field(..., min_length=1, max_length=1000, description="S3 file keys to sign")
+    expiration: int = Field(3600, ge=60, le=604800, description="URL expiration time in seconds")
+
 
 class S3FileUploader:
     """
@@ -17,7 +84,8 @@ class S3FileUploader:
     
     def __init__(self, aws_access_key_id: Optional[str] = None, 
                  aws_secret_access_key: Optional[str] = None, 
-                 region_name: str = "us-east-1"):
+                 region_name: str = "us-east-1",
+                 session: Optional[boto3.Session] = None):
         """
         Initialize the S3 client.
         
@@ -25,18 +93,25 @@ class S3FileUploader:
             aws_access_key_id: AWS access key ID
             aws_secret_access_key: AWS secret access key
             region_name: AWS region name
+            session: Shared boto3 session to create the client from (takes precedence over keys)
         """
         try:
-            if aws_access_key_id and aws_secret_access_key:
-                self.s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=aws_access_key_id,
-                    aws_secret_access_key=aws_secret_access_key,
-                    region_name=region_name
-                )
-            else:
-                # Use default credentials (from environment, IAM role, etc.)
-                self.s3_client = boto3.client('s3', region_name=region_name)
+            if session is None:
+                if aws_access_key_id and aws_secret_access_key:
+                    session = boto3.Session(
+                        aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key,
+                        region_name=region_name
+                    )
+                else:
+                    # Use default credentials (from environment, IAM role, etc.)
+                    session = boto3.Session(region_name=region_name)
+            self.s3_client = session.client('s3', region_name=region_name, config=S3_CLIENT_CONFIG)
+            
+            # A presigned URL stops working when its signing session token expires, so URLs
+            # are only cached when signed with long-term keys
+            credentials = session.get_credentials()
+            self._url_cache = TTLCache(maxsize=10000) if is_long_term_credentials(credentials) else None
                 
         except NoCredentialsError:
             logger.error("AWS credentials not found")
@@ -59,9 +134,9 @@ class S3FileUploader:
         # Get file extension
         file_extension = os.path.splitext(original_filename)[1]
         
-        # Generate unique filename with timestamp and UUID
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
+        # Generate unique filename with timestamp and random suffix
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        unique_id = secrets.token_hex(4)
         
         filename = f"{timestamp}_{unique_id}{file_extension}"
         
@@ -85,6 +160,12 @@ class S3FileUploader:
         if not file.filename.lower().endswith('.pdf'):
             return False
         
+        # Check the PDF header without reading the rest of the body
+        header = file.file.read(len(PDF_MAGIC_BYTES))
+        file.file.seek(0)
+        if header != PDF_MAGIC_BYTES:
+            return False
+        
         return True
     
     async def upload_file(self, file: UploadFile, bucket_name: str, 
@@ -112,26 +193,34 @@ class S3FileUploader:
             # Generate unique file key
             file_key = self.generate_file_key(file.filename, folder)
             
-            # Read file content
-            file_content = await file.read()
+            # Determine file size without loading the body into memory
+            file.file.seek(0, os.SEEK_END)
+            file_size = file.file.tell()
+            file.file.seek(0)
             
-            # Upload to S3
-            self.s3_client.put_object(
-                Bucket=bucket_name,
-                Key=file_key,
-                Body=file_content,
-                ContentType=file.content_type,
-                Metadata={
-                    'original_filename': file.filename,
-                    'upload_timestamp': datetime.now().isoformat(),
-                    'file_size': str(len(file_content))
-                }
+            # Stream to S3 (multipart for large files) without blocking the event loop
+            await run_in_threadpool(
+                self.s3_client.upload_fileobj,
+                file.file,
+                bucket_name,
+                file_key,
+                ExtraArgs={
+                    'ContentType': file.content_type,
+                    # Per-part checksum verified by S3, computed while streaming
+                    'ChecksumAlgorithm': 'CRC32',
+                    'Metadata': {
+                        'original_filename': file.filename,
+                        'upload_timestamp': datetime.now().isoformat(),
+                        'file_size': str(file_size)
+                    }
+                },
+                Config=UPLOAD_TRANSFER_CONFIG
             )
             
             # Generate file URL
             file_url = f"https://{bucket_name}.s3.amazonaws.com/{file_key}"
             
-            logger.info(f"File uploaded successfully: {file_key}")
+            logger.info("File uploaded successfully: %s", file_key)
             
             return {
                 "success": True,
@@ -139,13 +228,15 @@ class S3FileUploader:
                 "file_key": file_key,
                 "file_url": file_url,
                 "original_filename": file.filename,
-                "file_size": len(file_content),
+                "file_size": file_size,
                 "bucket_name": bucket_name
             }
             
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            logger.error(f"AWS S3 error: {error_code} - {str(e)}")
+        except (ClientError, S3UploadFailedError) as e:
+            # upload_fileobj wraps the underlying ClientError in S3UploadFailedError
+            client_error = e if isinstance(e, ClientError) else e.__context__
+            error_code = client_error.response['Error']['Code'] if isinstance(client_error, ClientError) else 'Unknown'
+            logger.error("AWS S3 error: %s - %s", error_code, e)
             
             if error_code == 'NoSuchBucket':
                 raise HTTPException(
@@ -162,18 +253,100 @@ class S3FileUploader:
                     status_code=500,
                     detail=f"Failed to upload file to S3: {str(e)}"
                 )
+        
+        except HTTPException:
+            # Re-raise validation errors unchanged
+            raise
                 
         except Exception as e:
-            logger.error(f"Unexpected error during file upload: {str(e)}")
+            logger.error("Unexpected error during file upload: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail=f"An unexpected error occurred: {str(e)}"
             )
     
-    def get_file_url(self, bucket_name: str, file_key: str, expiration: int = 3600) -> str:
+    def download_file(self, bucket_name: str, file_key: str) -> bytes:
+        """
+        Download an object's content from S3 (blocking).
+        
+        Args:
+            bucket_name: S3 bucket name
+            file_key: S3 file key
+            
+        Returns:
+            Object body bytes
+        """
+        response = self.s3_client.get_object(Bucket=bucket_name, Key=file_key)
+        return response['Body'].read()
+    
+    def create_presigned_upload(self, bucket_name: str, original_filename: str,
+                                content_type: str, max_bytes: int,
+                                folder: str = "uploads", expiration: int = 900) -> dict:
+        """
+        Generate a presigned POST so the client uploads straight to S3.
+        
+        Args:
+            bucket_name: S3 bucket name
+            original_filename: The original filename (its extension is kept)
+            content_type: Content type the upload must declare
+            max_bytes: Largest object S3 will accept for this upload
+            folder: The folder prefix in S3
+            expiration: Seconds the upload form stays valid (default: 15 minutes)
+            
+        Returns:
+            Dictionary with the form URL, form fields and the assigned file key
+        """
+        file_key = self.generate_file_key(original_filename, folder)
+        
+        try:
+            presigned_post = self.s3_client.generate_presigned_post(
+                Bucket=bucket_name,
+                Key=file_key,
+                Fields={"Content-Type": content_type},
+                Conditions=[
+                    ["content-length-range", 1, max_bytes],
+                    {"Content-Type": content_type}
+                ],
+                ExpiresIn=expiration
+            )
+        except ClientError as e:
+            logger.error("Error generating presigned POST: %s", e)
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to generate upload URL"
+            )
+        
+        return {
+            "success": True,
+            "url": presigned_post["url"],
+            "fields": presigned_post["fields"],
+            "file_key": file_key,
+            "bucket": bucket_name,
+            "expiration_seconds": expiration
+        }
+    
+    def url_client_cache_seconds(self, expiration: int) -> int:
+        """
+        Seconds a client may reuse a URL returned by get_file_url.
+        
+        Args:
+            expiration: URL expiration time in seconds
+            
+        Returns:
+            The cache safety margin when URLs are signed with long-term keys, else 0
+        """
+        if self._url_cache is None:
+            return 0
+        return presigned_url_min_validity(expiration)
+    
+    async def get_file_url(self, bucket_name: str, file_key: str, expiration: int = 3600) -> str:
         """
         Generate a presigned URL for accessing a file in S3.
         
+        URLs signed with long-term keys are cached and cache hits are answered
+        on the event loop; otherwise every call signs afresh in the threadpool,
+        since the URL dies with the temporary credentials that signed it.
+        
         Args:
             bucket_name: S3 bucket name
             file_key: S3 file key
@@ -182,15 +355,25 @@ class S3FileUploader:
         Returns:
             Presigned URL string
         """
+        cache_key = (bucket_name, file_key, expiration)
+        if self._url_cache is not None:
+            url = self._url_cache.get(cache_key)
+            if url is not None:
+                return url
+        
         try:
-            url = self.s3_client.generate_presigned_url(
+            url = await run_in_threadpool(
+                self.s3_client.generate_presigned_url,
                 'get_object',
                 Params={'Bucket': bucket_name, 'Key': file_key},
                 ExpiresIn=expiration
             )
+            if self._url_cache is not None:
+                # Serve the same URL until shortly before it expires
+                self._url_cache.set(cache_key, url, ttl=expiration - presigned_url_min_validity(expiration))
             return url
         except ClientError as e:
-            logger.error(f"Error generating presigned URL: {str(e)}")
+            logger.error("Error generating presigned URL for %s/%s", bucket_name, file_key, exc_info=e)
             raise HTTPException(
                 status_code=500,
                 detail="Failed to generate file access URL"
@@ -5,6 +5,7 @@ This module handles text extraction from various file types (PDF, Word, JSON)
 and performs Named Entity Recognition using AWS services.
 """
 
+import asyncio
 import boto3
 import json
 import logging
@@ -13,10 +14,11 @@ import os
 from typing import Dict, List, Any, Optional, Union
 from botocore.exceptions import ClientError
 from fastapi import UploadFile
-import docx
-import PyPDF2
+from fastapi.concurrency import run_in_threadpool
 from io import BytesIO
 
+from .aws_session import assume_role_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,7 +32,8 @@ class AWSTextExtractor:
         aws_access_key_id: Optional[str] = None,
         aws_secret_access_key: Optional[str] = None,
         region_name: str = "us-east-1",
-        aws_role_arn: Optional[str] = None
+        aws_role_arn: Optional[str] = None,
+        session: Optional[boto3.Session] = None
     ):
         """
         Initialize AWS Text Extractor.
@@ -40,55 +43,50 @@ class AWSTextExtractor:
             aws_secret_access_key: AWS secret access key
             region_name: AWS region name
             aws_role_arn: AWS role ARN for role-based access
+            session: Shared boto3 session to create the clients from when no role is set
         """
         self.region_name = region_name
         self.aws_role_arn = aws_role_arn
         
         # Initialize AWS clients
-        self._init_aws_clients(aws_access_key_id, aws_secret_access_key)
+        self._init_aws_clients(aws_access_key_id, aws_secret_access_key, session)
     
     def _init_aws_clients(
         self,
         aws_access_key_id: Optional[str],
-        aws_secret_access_key: Optional[str]
+        aws_secret_access_key: Optional[str],
+        session: Optional[boto3.Session] = None
     ):
         """Initialize AWS service clients."""
         try:
-            session_kwargs = {"region_name": self.region_name}
-            
-            if aws_access_key_id and aws_secret_access_key:
-                session_kwargs.update({
-                    "aws_access_key_id": aws_access_key_id,
-                    "aws_secret_access_key": aws_secret_access_key
-                })
-            
-            # Create session
-            session = boto3.Session(**session_kwargs)
-            
-            # Assume role if specified
             if self.aws_role_arn:
-                sts_client = session.client('sts')
-                assumed_role = sts_client.assume_role(
-                    RoleArn=self.aws_role_arn,
-                    RoleSessionName='text-extraction-session'
+                # Credentials refresh before the STS token expires, so the extractor can be long-lived
+                session = assume_role_session(
+                    aws_role_arn=self.aws_role_arn,
+                    aws_access_key_id=aws_access_key_id,
+                    aws_secret_access_key=aws_secret_access_key,
+                    region_name=self.region_name,
+                    session_name='text-extraction-session'
                 )
+            elif session is None:
+                session_kwargs = {"region_name": self.region_name}
                 
-                credentials = assumed_role['Credentials']
-                session = boto3.Session(
-                    aws_access_key_id=credentials['AccessKeyId'],
-                    aws_secret_access_key=credentials['SecretAccessKey'],
-                    aws_session_token=credentials['SessionToken'],
-                    region_name=self.region_name
-                )
+                if aws_access_key_id and aws_secret_access_key:
+                    session_kwargs.update({
+                        "aws_access_key_id": aws_access_key_id,
+                        "aws_secret_access_key": aws_secret_access_key
+                    })
+                
+                session = boto3.Session(**session_kwargs)
             
             # Initialize service clients
-            self.textract_client = session.client('textract')
-            self.comprehend_medical_client = session.client('comprehendmedical')
+            self.textract_client = session.client('textract', region_name=self.region_name)
+            self.comprehend_medical_client = session.client('comprehendmedical', region_name=self.region_name)
             
             logger.info("AWS clients initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize AWS clients: {str(e)}")
+            logger.error("Failed to initialize AWS clients: %s", e)
             raise
     
     async def extract_and_analyze(
@@ -127,7 +125,7 @@ class AWSTextExtractor:
             return result
             
         except Exception as e:
-            logger.error(f"Error in extract_and_analyze: {str(e)}")
+            logger.error("Error in extract_and_analyze: %s", e)
             raise
     
     async def _extract_text(self, file: Union[UploadFile, bytes, str], file_type: str) -> str:
@@ -158,7 +156,8 @@ class AWSTextExtractor:
                     file_bytes = f.read()
             
             # Use Textract for PDF text extraction
-            response = self.textract_client.detect_document_text(
+            response = await run_in_threadpool(
+                self.textract_client.detect_document_text,
                 Document={'Bytes': file_bytes}
             )
             
@@ -171,16 +170,19 @@ class AWSTextExtractor:
             return extracted_text.strip()
             
         except ClientError as e:
-            logger.error(f"AWS Textract error: {str(e)}")
+            logger.error("AWS Textract error: %s", e)
             # Fallback to PyPDF2 if Textract fails
             return await self._extract_pdf_fallback(file)
         except Exception as e:
-            logger.error(f"PDF extraction error: {str(e)}")
+            logger.error("PDF extraction error: %s", e)
             return await self._extract_pdf_fallback(file)
     
     async def _extract_pdf_fallback(self, file: Union[UploadFile, bytes, str]) -> str:
         """Fallback PDF extraction using PyPDF2."""
         try:
+            # Imported lazily: only the Textract fallback path needs PyPDF2
+            import PyPDF2
+
             if isinstance(file, UploadFile):
                 file_bytes = await file.read()
                 pdf_file = BytesIO(file_bytes)
@@ -189,11 +191,12 @@ class AWSTextExtractor:
             else:
                 pdf_file = open(file, 'rb')
             
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
+            def read_pages() -> str:
+                pdf_reader = PyPDF2.PdfReader(pdf_file)
+                return "".join(page.extract_text() + "\n" for page in pdf_reader.pages)
             
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+            # Page parsing is CPU-bound; keep it off the event loop
+            text = await run_in_threadpool(read_pages)
             
             if not isinstance(file, (UploadFile, bytes)):
                 pdf_file.close()
@@ -201,12 +204,15 @@ class AWSTextExtractor:
             return text.strip()
             
         except Exception as e:
-            logger.error(f"PDF fallback extraction error: {str(e)}")
+            logger.error("PDF fallback extraction error: %s", e)
             return ""
     
     async def _extract_from_word(self, file: Union[UploadFile, bytes, str]) -> str:
         """Extract text from Word document."""
         try:
+            # Imported lazily: python-docx pulls in lxml, which is costly at startup
+            import docx
+
             if isinstance(file, UploadFile):
                 # Save to temporary file for docx processing
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp_file:
@@ -230,7 +236,7 @@ class AWSTextExtractor:
             return text.strip()
             
         except Exception as e:
-            logger.error(f"Word document extraction error: {str(e)}")
+            logger.error("Word document extraction error: %s", e)
             return ""
     
     async def _extract_from_json(self, file: Union[UploadFile, bytes, str]) -> str:
@@ -249,7 +255,7 @@ class AWSTextExtractor:
             return json.dumps(json_data, indent=2, ensure_ascii=False)
             
         except Exception as e:
-            logger.error(f"JSON extraction error: {str(e)}")
+            logger.error("JSON extraction error: %s", e)
             return ""
     
     async def _extract_from_text(self, file: Union[UploadFile, bytes, str]) -> str:
@@ -265,7 +271,7 @@ class AWSTextExtractor:
                     return f.read()
             
         except Exception as e:
-            logger.error(f"Text file extraction error: {str(e)}")
+            logger.error("Text file extraction error: %s", e)
             return ""
     
     async def _perform_ner(self, text: str) -> Dict[str, Any]:
@@ -277,9 +283,10 @@ class AWSTextExtractor:
                 text = text[:max_length]
                 logger.warning("Text truncated for NER analysis due to length limit")
             
-            # Use Comprehend Medical for medical NER
-            entities_response = self.comprehend_medical_client.detect_entities_v2(
-                Text=text
+            # Medical entities and PHI are independent calls; run them concurrently off the event loop
+            entities_response, phi_response = await asyncio.gather(
+                run_in_threadpool(self.comprehend_medical_client.detect_entities_v2, Text=text),
+                run_in_threadpool(self.comprehend_medical_client.detect_phi, Text=text)
             )
             
             # Process entities
@@ -295,11 +302,7 @@ class AWSTextExtractor:
                     "attributes": entity.get('Attributes', [])
                 })
             
-            # Also detect PHI (Personal Health Information)
-            phi_response = self.comprehend_medical_client.detect_phi(
-                Text=text
-            )
-            
+            # Also report PHI (Personal Health Information)
             phi_entities = []
             for entity in phi_response.get('Entities', []):
                 phi_entities.append({
@@ -321,7 +324,7 @@ class AWSTextExtractor:
             }
             
         except ClientError as e:
-            logger.error(f"AWS Comprehend Medical error: {str(e)}")
+            logger.error("AWS Comprehend Medical error: %s", e)
             return {
                 "error": f"NER analysis failed: {str(e)}",
                 "medical_entities": [],
@@ -330,7 +333,7 @@ class AWSTextExtractor:
                 "total_phi_entities": 0
             }
         except Exception as e:
-            logger.error(f"NER analysis error: {str(e)}")
+            logger.error("NER analysis error: %s", e)
             return {
                 "error": f"NER analysis failed: {str(e)}",
                 "medical_entities": [],
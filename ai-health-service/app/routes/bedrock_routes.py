@@ -4,33 +4,127 @@ Bedrock Access and Permission Check Routes
 This module contains endpoints for diagnosing AWS Bedrock access and IAM permissions.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
-import json
 import boto3
+import orjson
 from datetime import datetime
 from botocore.exceptions import ClientError
 from typing import Dict, Any
 
-from ..config import settings
-from ..modules.care_plan import BedrockCarePlanGenerator
+from ..config import BEDROCK_REGION
+from ..modules.care_plan import BedrockCarePlanGenerator, BEDROCK_CLIENT_CONFIG
+from .care_plan_routes import get_care_plan_generator
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/bedrock", tags=["Bedrock Access"])
 
+# Minimal request used to probe bedrock:InvokeModel, serialized to bytes once
+PERMISSION_TEST_MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+PERMISSION_TEST_BODY = orjson.dumps({
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 1,
+    "messages": [{"role": "user", "content": "Hi"}]
+})
 
-def get_care_plan_generator() -> BedrockCarePlanGenerator:
+
+def create_permission_clients(session: boto3.Session) -> Dict[str, Any]:
+    """
+    Build the clients used by the permission probes (called once at startup).
+    """
+    return {
+        "bedrock": session.client('bedrock', region_name=BEDROCK_REGION, config=BEDROCK_CLIENT_CONFIG),
+        "bedrock-runtime": session.client('bedrock-runtime', region_name=BEDROCK_REGION, config=BEDROCK_CLIENT_CONFIG),
+        "sts": session.client('sts', region_name=BEDROCK_REGION, config=BEDROCK_CLIENT_CONFIG)
+    }
+
+
+def get_permission_clients(request: Request) -> Dict[str, Any]:
     """
-    Dependency to get Bedrock care plan generator instance.
+    Dependency to get the permission probe clients created at startup.
     """
-    return BedrockCarePlanGenerator(
-        aws_access_key_id=settings.aws_access_key_id,
-        aws_secret_access_key=settings.aws_secret_access_key,
-        region_name=settings.effective_bedrock_region,
-        aws_role_arn=settings.aws_role_arn
-    )
+    return request.app.state.permission_clients
+
+
+def _check_list_foundation_models(bedrock_client) -> Dict[str, Any]:
+    """Probe bedrock:ListFoundationModels."""
+    try:
+        response = bedrock_client.list_foundation_models()
+        return {
+            "status": "allowed",
+            "details": f"Can list {len(response.get('modelSummaries', []))} models"
+        }
+    except ClientError as e:
+        return {
+            "status": "denied",
+            "error_code": e.response['Error']['Code'],
+            "message": e.response['Error']['Message']
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+def _check_invoke_model(bedrock_runtime) -> Dict[str, Any]:
+    """Probe bedrock:InvokeModel (a model access error still proves the permission)."""
+    try:
+        bedrock_runtime.invoke_model(
+            modelId=PERMISSION_TEST_MODEL_ID,
+            body=PERMISSION_TEST_BODY,
+            contentType='application/json',
+            accept='application/json'
+        )
+        return {
+            "status": "allowed",
+            "details": "Successfully invoked model"
+        }
+    except ClientError as invoke_error:
+        error_code = invoke_error.response['Error']['Code']
+        if error_code == 'AccessDeniedException':
+            if 'does not have access to model' in invoke_error.response['Error']['Message']:
+                return {
+                    "status": "permission_allowed_model_access_needed",
+                    "details": "Has invoke permission but needs model access"
+                }
+            return {
+                "status": "denied",
+                "error_code": error_code,
+                "message": invoke_error.response['Error']['Message']
+            }
+        return {
+            "status": "allowed_with_restrictions",
+            "details": f"Has permission but encountered: {error_code}"
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
+
+def _check_caller_identity(sts_client) -> Dict[str, Any]:
+    """Probe sts:GetCallerIdentity."""
+    try:
+        identity = sts_client.get_caller_identity()
+        return {
+            "status": "allowed",
+            "identity": {
+                "account": identity.get('Account'),
+                "arn": identity.get('Arn'),
+                "user_id": identity.get('UserId')
+            }
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
 
 
 @router.get("/access-check")
@@ -50,12 +144,12 @@ async def check_bedrock_access(
         JSON response with detailed access check results
     """
     try:
-        access_results = care_plan_generator.check_bedrock_access()
+        access_results = await care_plan_generator.check_bedrock_access()
         
         # Determine HTTP status based on overall access
         status_code = 200 if access_results.get("overall_access", False) else 503
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status_code,
             content={
                 "success": access_results.get("overall_access", False),
@@ -80,8 +174,8 @@ async def check_bedrock_access(
         )
         
     except Exception as e:
-        logger.error(f"Unexpected error in bedrock access check endpoint: {str(e)}")
-        return JSONResponse(
+        logger.error("Unexpected error in bedrock access check endpoint: %s", e)
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -93,10 +187,18 @@ async def check_bedrock_access(
 
 
 @router.get("/permissions")
-async def check_bedrock_permissions():
+async def check_bedrock_permissions(
+    clients: Dict[str, Any] = Depends(get_permission_clients)
+):
     """
     Check specific IAM permissions for Bedrock access.
     
+    The three probes are independent blocking AWS calls, so they run
+    concurrently in the threadpool instead of on the event loop.
+    
+    Args:
+        clients: Permission probe clients dependency
+    
     Returns:
         JSON response with IAM permission analysis
     """
@@ -107,94 +209,14 @@ async def check_bedrock_permissions():
             "overall_status": "unknown"
         }
         
-        # Test different Bedrock permissions
-        region = settings.effective_bedrock_region
-        
-        # Check bedrock:ListFoundationModels
-        try:
-            bedrock_client = boto3.client('bedrock', region_name=region)
-            response = bedrock_client.list_foundation_models()
-            permissions_check["permissions"]["bedrock:ListFoundationModels"] = {
-                "status": "allowed",
-                "details": f"Can list {len(response.get('modelSummaries', []))} models"
-            }
-        except ClientError as e:
-            permissions_check["permissions"]["bedrock:ListFoundationModels"] = {
-                "status": "denied",
-                "error_code": e.response['Error']['Code'],
-                "message": e.response['Error']['Message']
-            }
-        except Exception as e:
-            permissions_check["permissions"]["bedrock:ListFoundationModels"] = {
-                "status": "error",
-                "message": str(e)
-            }
-        
-        # Check bedrock:InvokeModel
-        try:
-            bedrock_runtime = boto3.client('bedrock-runtime', region_name=region)
-            # Try a minimal invoke to test permission (will likely fail on model access, but tests permission)
-            test_body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1,
-                "messages": [{"role": "user", "content": "Hi"}]
-            }
-            
-            # This will likely fail due to model access, but we can check the error type
-            try:
-                bedrock_runtime.invoke_model(
-                    modelId="anthropic.claude-3-haiku-20240307-v1:0",
-                    body=json.dumps(test_body),
-                    contentType='application/json',
-                    accept='application/json'
-                )
-                permissions_check["permissions"]["bedrock:InvokeModel"] = {
-                    "status": "allowed",
-                    "details": "Successfully invoked model"
-                }
-            except ClientError as invoke_error:
-                error_code = invoke_error.response['Error']['Code']
-                if error_code == 'AccessDeniedException':
-                    if 'does not have access to model' in invoke_error.response['Error']['Message']:
-                        permissions_check["permissions"]["bedrock:InvokeModel"] = {
-                            "status": "permission_allowed_model_access_needed",
-                            "details": "Has invoke permission but needs model access"
-                        }
-                    else:
-                        permissions_check["permissions"]["bedrock:InvokeModel"] = {
-                            "status": "denied",
-                            "error_code": error_code,
-                            "message": invoke_error.response['Error']['Message']
-                        }
-                else:
-                    permissions_check["permissions"]["bedrock:InvokeModel"] = {
-                        "status": "allowed_with_restrictions",
-                        "details": f"Has permission but encountered: {error_code}"
-                    }
-                    
-        except Exception as e:
-            permissions_check["permissions"]["bedrock:InvokeModel"] = {
-                "status": "error",
-                "message": str(e)
-            }
-        
-        # Check STS permissions (to get identity)
-        try:
-            sts_client = boto3.client('sts', region_name=region)
-            identity = sts_client.get_caller_identity()
-            permissions_check["permissions"]["sts:GetCallerIdentity"] = {
-                "status": "allowed",
-                "identity": {
-                    "account": identity.get('Account'),
-                    "arn": identity.get('Arn'),
-                    "user_id": identity.get('UserId')
-                }
-            }
-        except Exception as e:
-            permissions_check["permissions"]["sts:GetCallerIdentity"] = {
-                "status": "error",
-                "message": str(e)
-            }
+        list_models, invoke_model, caller_identity = await asyncio.gather(
+            run_in_threadpool(_check_list_foundation_models, clients["bedrock"]),
+            run_in_threadpool(_check_invoke_model, clients["bedrock-runtime"]),
+            run_in_threadpool(_check_caller_identity, clients["sts"])
+        )
+        permissions_check["permissions"]["bedrock:ListFoundationModels"] = list_models
+        permissions_check["permissions"]["bedrock:InvokeModel"] = invoke_model
+        permissions_check["permissions"]["sts:GetCallerIdentity"] = caller_identity
         
         # Determine overall status
         allowed_permissions = sum(1 for perm in permissions_check["permissions"].values() 
@@ -214,14 +236,13 @@ async def check_bedrock_permissions():
             "success_rate": f"{(allowed_permissions/total_permissions*100):.1f}%" if total_permissions > 0 else "0%"
         }
         
-        return JSONResponse(
-            status_code=200,
+        return ORJSONResponse(
             content=permissions_check
         )
         
     except Exception as e:
-        logger.error(f"Unexpected error in bedrock permissions check: {str(e)}")
-        return JSONResponse(
+        logger.error("Unexpected error in bedrock permissions check: %s", e)
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -4,20 +4,34 @@ Care Plan Generation Routes
 This module contains all endpoints related to AI-powered care plan generation using Amazon Bedrock.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import asyncio
+import boto3
+import gzip
 import logging
-from typing import Optional
+import orjson
+from botocore.exceptions import ClientError
+from typing import AsyncIterator, Optional
 from datetime import datetime
 
-from ..config import settings
+from ..config import settings, BEDROCK_MODEL_ID, BEDROCK_REGION, CLAUDE_37_SONNET_MODEL_ID, FAST_MODEL_ID, NOVA_MICRO_MODEL_ID
 from ..modules.care_plan import (
     BedrockCarePlanGenerator, 
     DoctorPrescription, 
     CarePlan, 
+    CarePlanResponse,
+    CarePlanComparisonResponse,
+    CarePlanBatchRequest,
+    CarePlanBatchResponse,
+    ModelCarePlanResult,
     PatientInfo, 
     PrescriptionItem,
-    CarePlanSection
+    CarePlanSection,
+    Priority,
+    select_care_plan_model,
+    supports_latency_optimized
 )
 
 logger = logging.getLogger(__name__)
@@ -25,23 +39,295 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/care-plan", tags=["Care Plan Generation"])
 
 
-def get_care_plan_generator() -> BedrockCarePlanGenerator:
+# Sample prescription for the Claude 3.7 Sonnet sample endpoint
+CLAUDE_37_SAMPLE_PRESCRIPTION = DoctorPrescription(
+    patient_info=PatientInfo(
+        age=32,
+        gender="Male",
+        weight=75.0,
+        medical_conditions=["Mild asthma"],
+        allergies=["Shellfish"]
+    ),
+    diagnosis="Upper respiratory tract infection",
+    prescriptions=[
+        PrescriptionItem(
+            medication_name="Azithromycin",
+            dosage="500mg on day 1, then 250mg daily",
+            duration="5 days",
+            instructions="Take on empty stomach 1 hour before or 2 hours after meals"
+        ),
+        PrescriptionItem(
+            medication_name="Guaifenesin",
+            dosage="400mg every 4 hours",
+            duration="7 days",
+            instructions="Take with plenty of water to help loosen mucus"
+        ),
+        PrescriptionItem(
+            medication_name="Throat lozenges",
+            dosage="As needed",
+            duration="Until symptoms resolve",
+            instructions="Use for throat discomfort, maximum 6 per day"
+        )
+    ],
+    doctor_notes="Patient has mild asthma but well-controlled. Watch for any respiratory distress. Continue usual asthma medications. Return if symptoms worsen or persist beyond 7 days."
+)
+
+# Complex multi-condition sample prescription for the Nova Micro sample endpoint
+NOVA_MICRO_SAMPLE_PRESCRIPTION = DoctorPrescription(
+    patient_info=PatientInfo(
+        age=65,
+        gender="Female", 
+        weight=68.0,
+        medical_conditions=["Hypertension", "Type 2 Diabetes", "Chronic Kidney Disease Stage 3"],
+        allergies=["Penicillin", "Iodine contrast"]
+    ),
+    diagnosis="Acute exacerbation of chronic heart failure with reduced ejection fraction",
+    prescriptions=[
+        PrescriptionItem(
+            medication_name="Furosemide",
+            dosage="40mg twice daily",
+            duration="14 days, then reassess",
+            instructions="Take with food. Monitor weight daily. Report weight gain >2lbs in 24hrs"
+        ),
+        PrescriptionItem(
+            medication_name="Metoprolol succinate",
+            dosage="25mg daily",
+            duration="Ongoing",
+            instructions="Take with or without food. Do not stop abruptly. Check pulse before taking"
+        ),
+        PrescriptionItem(
+            medication_name="Lisinopril",
+            dosage="5mg daily",
+            duration="Ongoing",
+            instructions="Take at same time daily. Avoid potassium supplements. Monitor kidney function"
+        ),
+        PrescriptionItem(
+            medication_name="Metformin",
+            dosage="500mg twice daily",
+            duration="Ongoing",
+            instructions="Take with meals. Hold if contrast study or surgery planned"
+        )
+    ],
+    doctor_notes="Patient presents with dyspnea, peripheral edema, and weight gain. Chest X-ray shows pulmonary edema. BNP elevated at 850. Creatinine 1.8 (baseline 1.5). Careful fluid balance management needed. Follow up in 1 week for weight and symptoms. Cardiology referral if no improvement."
+)
+
+NOVA_MICRO_MEDICAL_FACTORS_FOCUS = {
+    "primary_conditions": ["Heart Failure", "Diabetes", "Hypertension", "CKD"],
+    "key_considerations": ["Fluid management", "Kidney function monitoring", "Drug interactions"],
+    "complexity_level": "High - multiple comorbidities requiring careful coordination"
+}
+
+# Demo sample prescription for the Bedrock-free demo endpoint
+DEMO_SAMPLE_PRESCRIPTION = DoctorPrescription(
+    patient_info=PatientInfo(
+        age=45,
+        gender="Female",
+        weight=68.5,
+        medical_conditions=["Hypertension", "Type 2 Diabetes"],
+        allergies=["Penicillin"]
+    ),
+    diagnosis="Acute bronchitis with underlying comorbidities",
+    prescriptions=[
+        PrescriptionItem(
+            medication_name="Amoxicillin-Clavulanate",
+            dosage="875mg/125mg twice daily",
+            duration="7 days",
+            instructions="Take with food to reduce stomach upset"
+        ),
+        PrescriptionItem(
+            medication_name="Dextromethorphan",
+            dosage="15mg every 4 hours as needed",
+            duration="Up to 7 days",
+            instructions="For cough suppression, do not exceed 6 doses per day"
+        )
+    ],
+    doctor_notes="Patient has well-controlled diabetes and hypertension. Monitor blood sugar levels during antibiotic treatment."
+)
+
+# Demo care plan (what Bedrock would generate)
+DEMO_CARE_PLAN = CarePlan(
+    patient_summary="45-year-old female with acute bronchitis, complicated by well-controlled hypertension and type 2 diabetes. Requires antibiotic treatment with careful monitoring of blood glucose levels.",
+    care_goals=[
+        "Resolve acute bronchitis symptoms within 7-10 days",
+        "Maintain stable blood glucose levels during antibiotic treatment",
+        "Prevent complications and ensure medication adherence",
+        "Monitor for signs of treatment response and potential side effects"
+    ],
+    medication_management=[
+        CarePlanSection(
+            title="Antibiotic Management",
+            content="Take Amoxicillin-Clavulanate 875mg/125mg twice daily for 7 days. Take with food to minimize gastrointestinal upset. Complete the full course even if symptoms improve.",
+            priority=Priority.HIGH
+        ),
+        CarePlanSection(
+            title="Cough Management",
+            content="Use Dextromethorphan 15mg every 4 hours as needed for cough. Do not exceed 6 doses per day. Discontinue if cough resolves.",
+            priority=Priority.MEDIUM
+        ),
+        CarePlanSection(
+            title="Blood Sugar Monitoring",
+            content="Monitor blood glucose levels more frequently during antibiotic treatment. Check 2-3 times daily and maintain diabetes medication regimen.",
+            priority=Priority.HIGH
+        )
+    ],
+    lifestyle_recommendations=[
+        CarePlanSection(
+            title="Rest and Recovery",
+            content="Ensure adequate rest, aim for 7-8 hours of sleep nightly. Avoid strenuous activities until symptoms resolve.",
+            priority=Priority.HIGH
+        ),
+        CarePlanSection(
+            title="Hydration",
+            content="Increase fluid intake to 8-10 glasses of water daily to help thin mucus and support recovery.",
+            priority=Priority.MEDIUM
+        ),
+        CarePlanSection(
+            title="Nutrition",
+            content="Maintain diabetic diet plan. Eat with medications to reduce stomach upset. Include probiotic foods to support gut health during antibiotic use.",
+            priority=Priority.MEDIUM
+        )
+    ],
+    monitoring_schedule=[
+        CarePlanSection(
+            title="Daily Monitoring",
+            content="Check blood glucose 2-3 times daily. Monitor temperature twice daily. Track cough severity and sputum production.",
+            priority=Priority.HIGH
+        ),
+        CarePlanSection(
+            title="Weekly Assessment",
+            content="Evaluate overall symptom improvement. Assess medication tolerance and side effects.",
+            priority=Priority.MEDIUM
+        )
+    ],
+    warning_signs=[
+        "Worsening shortness of breath or chest pain",
+        "Blood glucose levels consistently above 300 mg/dL",
+        "Signs of severe allergic reaction (rash, difficulty breathing)",
+        "Persistent fever above 101°F after 48 hours of treatment",
+        "Severe diarrhea or signs of C. difficile infection",
+        "No improvement in cough or symptoms after 5 days"
+    ],
+    follow_up_recommendations=[
+        CarePlanSection(
+            title="Primary Care Follow-up",
+            content="Schedule follow-up appointment in 1-2 weeks if symptoms persist or worsen. Earlier if warning signs develop.",
+            priority=Priority.HIGH
+        ),
+        CarePlanSection(
+            title="Diabetes Management",
+            content="Continue regular endocrinology appointments. Inform diabetes care team of antibiotic treatment.",
+            priority=Priority.MEDIUM
+        )
+    ]
+)
+
+
+# The demo response is constant, so serialize it once at import
+DEMO_PAYLOAD_BYTES = orjson.dumps({
+    "success": True,
+    "message": "Demo care plan generated (structure example)",
+    "note": "This is a demo showing the expected care plan structure. Use /care-plan/claude-37-sonnet/sample for Bedrock-generated plans.",
+    "care_plan": DEMO_CARE_PLAN.model_dump(mode="json"),
+    "sample_prescription": DEMO_SAMPLE_PRESCRIPTION.model_dump(mode="json", exclude_none=True),
+    "bedrock_required": False
+})
+DEMO_PAYLOAD_GZIP = gzip.compress(DEMO_PAYLOAD_BYTES, compresslevel=5)
+
+
+# Models run side by side by /compare: result key -> (model ID, comparison note)
+COMPARISON_MODELS = {
+    "claude_4_5_sonnet": (settings.bedrock_model_id, "Premium model with enhanced capabilities (requires payment)"),
+    "claude_3_7_sonnet": (settings.claude_37_sonnet_model_id, "Latest standard model with improved capabilities"),
+    "claude_3_5_sonnet": (settings.claude_35_sonnet_model_id, "Standard model with proven performance"),
+    "claude_3_sonnet": (settings.claude_3_sonnet_model_id, "Baseline standard model, reliable and cost-effective"),
+    "nova_micro": (settings.nova_micro_model_id, "Amazon Nova Micro - Fast, cost-effective text generation")
+}
+
+COMPARISON_NOTES = {name: note for name, (_, note) in COMPARISON_MODELS.items()}
+
+
+def care_plan_response(payload: CarePlanResponse) -> Response:
+    """
+    Serialize a care plan envelope straight to JSON bytes in pydantic-core,
+    without an intermediate dict pass.
+    """
+    return Response(
+        content=payload.model_dump_json(exclude_none=True),
+        media_type="application/json"
+    )
+
+
+def generation_error(exc: Exception) -> str:
     """
-    Dependency to get Bedrock care plan generator instance.
+    Error text for one failed generation in a multi-plan response.
     """
+    return exc.detail if isinstance(exc, HTTPException) else str(exc)
+
+
+def create_care_plan_generator(session: Optional[boto3.Session] = None) -> BedrockCarePlanGenerator:
+    """
+    Build the Bedrock care plan generator shared by all requests.
+    
+    Called once from the application lifespan; role-based credentials
+    refresh themselves before the STS token expires.
+    """
+    if settings.bedrock_performance_mode != "standard":
+        standard_models = sorted({
+            model_id for model_id, _ in COMPARISON_MODELS.values()
+            if not supports_latency_optimized(model_id)
+        })
+        if standard_models:
+            logger.info("⏱️ Latency-optimized inference not supported, using standard latency for: %s",
+                        ", ".join(standard_models))
+    
     return BedrockCarePlanGenerator(
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
-        region_name=settings.effective_bedrock_region,
-        aws_role_arn=settings.aws_role_arn
+        region_name=BEDROCK_REGION,
+        aws_role_arn=settings.aws_role_arn,
+        performance_config={"latency": settings.bedrock_performance_mode},
+        session=session,
+        care_plan_cache_ttl=settings.care_plan_cache_ttl,
+        care_plan_cache_size=settings.care_plan_cache_size
     )
 
 
+def get_care_plan_generator(request: Request) -> BedrockCarePlanGenerator:
+    """
+    Dependency to get the Bedrock care plan generator created at startup.
+    """
+    return request.app.state.care_plan_generator
 
 
+@router.get("/models")
+async def list_bedrock_models(
+    care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
+):
+    """
+    List available Amazon Bedrock models for care plan generation.
+    
+    Args:
+        care_plan_generator: Bedrock care plan generator dependency
+    
+    Returns:
+        JSON response with available and configured models
+    """
+    # Served from the generator's TTL cache after the first successful listing
+    available_models = await run_in_threadpool(care_plan_generator.list_available_models)
+    
+    return ORJSONResponse(
+        content={
+            "success": True,
+            "available_models": available_models,
+            "configured_models": {name: model_id for name, (model_id, _) in COMPARISON_MODELS.items()},
+            "current_default": BEDROCK_MODEL_ID,
+            "total_models": len(available_models),
+            "comparison_endpoint": "/care-plan/compare"
+        }
+    )
 
 
-@router.post("/claude-37-sonnet")
+@router.post("/claude-37-sonnet", response_model=CarePlanResponse)
 async def generate_care_plan_claude_37(
     prescription: DoctorPrescription,
     care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
@@ -56,37 +342,69 @@ async def generate_care_plan_claude_37(
     Returns:
         JSON response with generated care plan using Claude 3.7 Sonnet
     """
+    # Generate care plan using Claude 3.7 Sonnet
+    care_plan = await care_plan_generator.generate_care_plan(
+        prescription=prescription,
+        model_id=CLAUDE_37_SONNET_MODEL_ID
+    )
+    
+    return care_plan_response(CarePlanResponse(
+        success=True,
+        message="Care plan generated successfully with Claude 3.7 Sonnet",
+        care_plan=care_plan,
+        model_used=CLAUDE_37_SONNET_MODEL_ID,
+        diagnosis=prescription.diagnosis,
+        model_type="Claude 3.7 Sonnet (Latest Standard)"
+    ))
+
+
+@router.post("/claude-37-sonnet/stream")
+async def stream_care_plan_claude_37(
+    prescription: DoctorPrescription,
+    care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
+):
+    """
+    Stream a care plan from Claude 3.7 Sonnet as it is generated.
+    
+    The body is the model's raw text, sent chunk by chunk as it is written
+    (text/plain). It normally holds the care plan JSON (same structure as the
+    "care_plan" field of /claude-37-sonnet), but it is not parsed or validated,
+    so it may be wrapped in a markdown fence or a sentence of prose. A cached
+    plan is sent as its validated JSON.
+    
+    Args:
+        prescription: Doctor prescription with patient info and medications
+        care_plan_generator: Bedrock care plan generator dependency
+    
+    Returns:
+        Streaming response with the generated care plan text
+    """
+    chunks = care_plan_generator.stream_care_plan(
+        prescription=prescription,
+        model_id=CLAUDE_37_SONNET_MODEL_ID
+    )
+    # Wait for the first chunk so Bedrock errors still produce a proper error status
     try:
-        # Generate care plan using Claude 3.7 Sonnet
-        care_plan = await care_plan_generator.generate_care_plan(
-            prescription=prescription,
-            model_id=settings.claude_37_sonnet_model_id
-        )
-        
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Care plan generated successfully with Claude 3.7 Sonnet",
-                "care_plan": care_plan.dict(),
-                "model_used": settings.claude_37_sonnet_model_id,
-                "diagnosis": prescription.diagnosis,
-                "model_type": "Claude 3.7 Sonnet (Latest Standard)"
-            }
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in generate_care_plan_claude_37 endpoint: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate care plan with Claude 3.7 Sonnet: {str(e)}"
-        )
+        first_chunk = await chunks.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=502, detail="Bedrock returned an empty care plan stream")
+    except ClientError as e:
+        raise care_plan_generator.bedrock_http_error(e, CLAUDE_37_SONNET_MODEL_ID)
+    
+    async def body() -> AsyncIterator[str]:
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+    
+    # identity encoding keeps GZipMiddleware from buffering the stream
+    return StreamingResponse(
+        body(),
+        media_type="text/plain",
+        headers={"Content-Encoding": "identity"}
+    )
 
 
-@router.post("/claude-37-sonnet/sample")
+@router.post("/claude-37-sonnet/sample", response_model=CarePlanResponse)
 async def generate_sample_care_plan_claude_37(
     care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
 ):
@@ -99,75 +417,62 @@ async def generate_sample_care_plan_claude_37(
     Returns:
         JSON response with generated care plan from sample data using Claude 3.7 Sonnet
     """
-    try:
-        # Sample prescription data
-        sample_prescription = DoctorPrescription(
-            patient_info=PatientInfo(
-                age=32,
-                gender="Male",
-                weight=75.0,
-                medical_conditions=["Mild asthma"],
-                allergies=["Shellfish"]
-            ),
-            diagnosis="Upper respiratory tract infection",
-            prescriptions=[
-                PrescriptionItem(
-                    medication_name="Azithromycin",
-                    dosage="500mg on day 1, then 250mg daily",
-                    duration="5 days",
-                    instructions="Take on empty stomach 1 hour before or 2 hours after meals"
-                ),
-                PrescriptionItem(
-                    medication_name="Guaifenesin",
-                    dosage="400mg every 4 hours",
-                    duration="7 days",
-                    instructions="Take with plenty of water to help loosen mucus"
-                ),
-                PrescriptionItem(
-                    medication_name="Throat lozenges",
-                    dosage="As needed",
-                    duration="Until symptoms resolve",
-                    instructions="Use for throat discomfort, maximum 6 per day"
-                )
-            ],
-            doctor_notes="Patient has mild asthma but well-controlled. Watch for any respiratory distress. Continue usual asthma medications. Return if symptoms worsen or persist beyond 7 days."
-        )
-        
-        # Generate care plan using Claude 3.7 Sonnet
-        care_plan = await care_plan_generator.generate_care_plan(
-            prescription=sample_prescription,
-            model_id=settings.claude_37_sonnet_model_id
-        )
-        
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Sample care plan generated successfully with Claude 3.7 Sonnet",
-                "care_plan": care_plan.dict(),
-                "sample_prescription": sample_prescription.dict(),
-                "model_used": settings.claude_37_sonnet_model_id,
-                "model_type": "Claude 3.7 Sonnet (Latest Standard)"
-            }
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in generate_sample_care_plan_claude_37 endpoint: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate sample care plan with Claude 3.7 Sonnet: {str(e)}"
-        )
-
+    # Generate care plan using Claude 3.7 Sonnet
+    care_plan = await care_plan_generator.generate_care_plan(
+        prescription=CLAUDE_37_SAMPLE_PRESCRIPTION,
+        model_id=CLAUDE_37_SONNET_MODEL_ID
+    )
+    
+    return care_plan_response(CarePlanResponse(
+        success=True,
+        message="Sample care plan generated successfully with Claude 3.7 Sonnet",
+        care_plan=care_plan,
+        sample_prescription=CLAUDE_37_SAMPLE_PRESCRIPTION,
+        model_used=CLAUDE_37_SONNET_MODEL_ID,
+        model_type="Claude 3.7 Sonnet (Latest Standard)"
+    ))
 
 
+@router.post("/auto", response_model=CarePlanResponse)
+async def generate_care_plan_auto(
+    prescription: DoctorPrescription,
+    care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
+):
+    """
+    Generate a care plan with a model picked by prescription complexity.
+    
+    Simple prescriptions (at most two medications, no existing conditions) use
+    the faster model (FAST_MODEL_ID); all others use the default model
+    (BEDROCK_MODEL_ID). The chosen model is returned in model_used.
+    
+    Args:
+        prescription: Doctor prescription with patient info and medications
+        care_plan_generator: Bedrock care plan generator dependency
+    
+    Returns:
+        JSON response with generated care plan and the model used
+    """
+    model_id = select_care_plan_model(prescription, BEDROCK_MODEL_ID, FAST_MODEL_ID)
+    
+    care_plan = await care_plan_generator.generate_care_plan(
+        prescription=prescription,
+        model_id=model_id
+    )
+    
+    return care_plan_response(CarePlanResponse(
+        success=True,
+        message="Care plan generated successfully",
+        care_plan=care_plan,
+        diagnosis=prescription.diagnosis,
+        model_used=model_id,
+        model_type="Fast (simple prescription)" if model_id == FAST_MODEL_ID else "Default (complex prescription)"
+    ))
 
 
 # ================================ AMAZON NOVA MICRO ENDPOINTS ================================
 
-@router.post("/nova-micro")
+
+@router.post("/nova-micro", response_model=CarePlanResponse)
 async def generate_care_plan_nova_micro(
     prescription: DoctorPrescription,
     care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
@@ -185,39 +490,25 @@ async def generate_care_plan_nova_micro(
     Returns:
         JSON response with generated care plan and metadata
     """
-    try:
-        logger.info(f"🏥 Generating care plan with Nova Micro for: {prescription.diagnosis}")
-        
-        # Generate care plan using Amazon Nova Micro
-        care_plan = await care_plan_generator.generate_care_plan(
-            prescription=prescription,
-            model_id=settings.nova_micro_model_id
-        )
-        
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Care plan generated successfully with Amazon Nova Micro",
-                "care_plan": care_plan.dict(),
-                "diagnosis": prescription.diagnosis,
-                "model_used": settings.nova_micro_model_id,
-                "model_type": "Amazon Nova Micro"
-            }
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Error generating care plan with Nova Micro: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate care plan with Amazon Nova Micro: {str(e)}"
-        )
+    logger.info("🏥 Generating care plan with Nova Micro for: %s", prescription.diagnosis)
+    
+    # Generate care plan using Amazon Nova Micro
+    care_plan = await care_plan_generator.generate_care_plan(
+        prescription=prescription,
+        model_id=NOVA_MICRO_MODEL_ID
+    )
+    
+    return care_plan_response(CarePlanResponse(
+        success=True,
+        message="Care plan generated successfully with Amazon Nova Micro",
+        care_plan=care_plan,
+        diagnosis=prescription.diagnosis,
+        model_used=NOVA_MICRO_MODEL_ID,
+        model_type="Amazon Nova Micro"
+    ))
 
 
-@router.post("/nova-micro/sample")
+@router.post("/nova-micro/sample", response_model=CarePlanResponse)
 async def generate_sample_care_plan_nova_micro(
     care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
 ):
@@ -233,79 +524,141 @@ async def generate_sample_care_plan_nova_micro(
     Returns:
         JSON response with generated care plan using sample prescription data
     """
-    try:
-        logger.info("🧪 Generating sample care plan with Amazon Nova Micro")
-        
-        # Create comprehensive sample prescription for medical factors demonstration
-        sample_prescription = DoctorPrescription(
-            patient_info=PatientInfo(
-                age=65,
-                gender="Female", 
-                weight=68.0,
-                medical_conditions=["Hypertension", "Type 2 Diabetes", "Chronic Kidney Disease Stage 3"],
-                allergies=["Penicillin", "Iodine contrast"]
-            ),
-            diagnosis="Acute exacerbation of chronic heart failure with reduced ejection fraction",
-            prescriptions=[
-                PrescriptionItem(
-                    medication_name="Furosemide",
-                    dosage="40mg twice daily",
-                    duration="14 days, then reassess",
-                    instructions="Take with food. Monitor weight daily. Report weight gain >2lbs in 24hrs"
-                ),
-                PrescriptionItem(
-                    medication_name="Metoprolol succinate",
-                    dosage="25mg daily",
-                    duration="Ongoing",
-                    instructions="Take with or without food. Do not stop abruptly. Check pulse before taking"
-                ),
-                PrescriptionItem(
-                    medication_name="Lisinopril",
-                    dosage="5mg daily",
-                    duration="Ongoing",
-                    instructions="Take at same time daily. Avoid potassium supplements. Monitor kidney function"
-                ),
-                PrescriptionItem(
-                    medication_name="Metformin",
-                    dosage="500mg twice daily",
-                    duration="Ongoing",
-                    instructions="Take with meals. Hold if contrast study or surgery planned"
-                )
-            ],
-            doctor_notes="Patient presents with dyspnea, peripheral edema, and weight gain. Chest X-ray shows pulmonary edema. BNP elevated at 850. Creatinine 1.8 (baseline 1.5). Careful fluid balance management needed. Follow up in 1 week for weight and symptoms. Cardiology referral if no improvement."
-        )
-        
-        # Generate care plan using Amazon Nova Micro
-        care_plan = await care_plan_generator.generate_care_plan(
-            prescription=sample_prescription,
-            model_id=settings.nova_micro_model_id
-        )
-        
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "message": "Sample care plan generated successfully with Amazon Nova Micro",
-                "care_plan": care_plan.dict(),
-                "sample_prescription": sample_prescription.dict(),
-                "model_used": settings.nova_micro_model_id,
-                "model_type": "Amazon Nova Micro",
-                "medical_factors_focus": {
-                    "primary_conditions": ["Heart Failure", "Diabetes", "Hypertension", "CKD"],
-                    "key_considerations": ["Fluid management", "Kidney function monitoring", "Drug interactions"],
-                    "complexity_level": "High - multiple comorbidities requiring careful coordination"
-                }
-            }
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in generate_sample_care_plan_nova_micro endpoint: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to generate sample care plan with Amazon Nova Micro: {str(e)}"
-        )
+    logger.info("🧪 Generating sample care plan with Amazon Nova Micro")
+    
+    # Generate care plan using Amazon Nova Micro
+    care_plan = await care_plan_generator.generate_care_plan(
+        prescription=NOVA_MICRO_SAMPLE_PRESCRIPTION,
+        model_id=NOVA_MICRO_MODEL_ID
+    )
+    
+    return care_plan_response(CarePlanResponse(
+        success=True,
+        message="Sample care plan generated successfully with Amazon Nova Micro",
+        care_plan=care_plan,
+        sample_prescription=NOVA_MICRO_SAMPLE_PRESCRIPTION,
+        model_used=NOVA_MICRO_MODEL_ID,
+        model_type="Amazon Nova Micro",
+        medical_factors_focus=NOVA_MICRO_MEDICAL_FACTORS_FOCUS
+    ))
+
+
+@router.post("/compare", response_model=CarePlanComparisonResponse)
+async def compare_care_plans(
+    prescription: DoctorPrescription,
+    care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
+):
+    """
+    Generate care plans with every configured model for comparison.
+    
+    The Bedrock calls are independent, so they run concurrently and the
+    endpoint takes as long as the slowest model rather than the sum of all.
+    
+    Args:
+        prescription: Doctor prescription with patient info and medications
+        care_plan_generator: Bedrock care plan generator dependency
+    
+    Returns:
+        JSON response with the care plan (or error) from each model
+    """
+    outcomes = await asyncio.gather(
+        *(
+            care_plan_generator.generate_care_plan(prescription=prescription, model_id=model_id)
+            for model_id, _ in COMPARISON_MODELS.values()
+        ),
+        return_exceptions=True
+    )
+    
+    results = {}
+    for (name, (model_id, _)), outcome in zip(COMPARISON_MODELS.items(), outcomes):
+        if isinstance(outcome, Exception):
+            results[name] = ModelCarePlanResult(success=False, model_used=model_id, error=generation_error(outcome))
+        else:
+            results[name] = ModelCarePlanResult(success=True, model_used=model_id, care_plan=outcome)
+    
+    successful_models = sum(1 for result in results.values() if result.success)
+    
+    comparison = CarePlanComparisonResponse(
+        success=successful_models == len(results),
+        message="Care plan comparison completed",
+        diagnosis=prescription.diagnosis,
+        successful_models=successful_models,
+        total_models=len(results),
+        results=results,
+        comparison_notes=COMPARISON_NOTES
+    )
+    return Response(
+        status_code=200 if successful_models else 500,
+        content=comparison.model_dump_json(exclude_none=True),
+        media_type="application/json"
+    )
+
+
+@router.post("/batch", response_model=CarePlanBatchResponse)
+async def generate_care_plans_batch(
+    batch: CarePlanBatchRequest,
+    care_plan_generator: BedrockCarePlanGenerator = Depends(get_care_plan_generator)
+):
+    """
+    Generate care plans for several prescriptions (e.g. a ward round) in one request.
+    
+    Each prescription is a separate Bedrock call; the calls run concurrently,
+    so the batch takes about as long as its slowest plan. Repeated
+    prescriptions are answered from the care plan cache.
+    
+    Args:
+        batch: Up to 8 prescriptions
+        care_plan_generator: Bedrock care plan generator dependency
+    
+    Returns:
+        JSON response with one result (care plan or error) per prescription, in request order
+    """
+    outcomes = await asyncio.gather(
+        *(
+            care_plan_generator.generate_care_plan(prescription=prescription, model_id=BEDROCK_MODEL_ID)
+            for prescription in batch.prescriptions
+        ),
+        return_exceptions=True
+    )
+    
+    results = [
+        ModelCarePlanResult(success=False, model_used=BEDROCK_MODEL_ID, error=generation_error(outcome))
+        if isinstance(outcome, Exception)
+        else ModelCarePlanResult(success=True, model_used=BEDROCK_MODEL_ID, care_plan=outcome)
+        for outcome in outcomes
+    ]
+    successful_plans = sum(1 for result in results if result.success)
+    
+    response = CarePlanBatchResponse(
+        success=successful_plans == len(results),
+        message="Batch care plan generation completed",
+        model_used=BEDROCK_MODEL_ID,
+        successful_plans=successful_plans,
+        total_plans=len(results),
+        results=results
+    )
+    return Response(
+        status_code=200 if successful_plans else 500,
+        content=response.model_dump_json(exclude_none=True),
+        media_type="application/json"
+    )
 
 
+@router.post("/demo")
+async def generate_demo_care_plan(request: Request):
+    """
+    Generate a demo care plan without calling Bedrock - shows expected structure.
+    
+    Args:
+        request: Incoming request, used to pick the precompressed body when accepted
+    
+    Returns:
+        JSON response with demo care plan structure
+    """
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=DEMO_PAYLOAD_GZIP,
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(content=DEMO_PAYLOAD_BYTES, media_type="application/json")
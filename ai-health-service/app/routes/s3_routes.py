@@ -4,31 +4,47 @@ S3 File Upload Routes
 This module contains all endpoints related to S3 file upload functionality.
 """
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+import asyncio
+import boto3
 import logging
+import json
+import re
 from typing import Optional
+from typing_extensions import Annotated
 from botocore.exceptions import ClientError
 
-from ..config import settings
-from ..modules.file_upload import S3FileUploader
+from ..config import settings, MAX_UPLOAD_BYTES, S3_BUCKET
+from ..modules.file_upload import S3FileUploader, PresignedUrlBatchRequest, PDF_MAGIC_BYTES
+from ..modules.text_extraction import AWSTextExtractor
+from .text_extraction_routes import get_text_extractor
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/upload", tags=["S3 File Upload"])
 
 
-def get_s3_uploader() -> S3FileUploader:
+def create_s3_uploader(session: Optional[boto3.Session] = None) -> S3FileUploader:
     """
-    Dependency to get S3 uploader instance.
+    Build the S3 uploader shared by all requests (called once at startup).
     """
     return S3FileUploader(
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
-        region_name=settings.aws_region
+        region_name=settings.aws_region,
+        session=session
     )
 
 
+def get_s3_uploader(request: Request) -> S3FileUploader:
+    """
+    Dependency to get the S3 uploader instance created at startup.
+    """
+    return request.app.state.s3_uploader
+
+
 @router.post("/pdf")
 async def upload_pdf(
     file: UploadFile = File(...),
@@ -46,33 +62,62 @@ async def upload_pdf(
     Returns:
         JSON response with upload details
     """
-    try:
-        # Validate that a file was uploaded
-        if not file:
-            raise HTTPException(status_code=400, detail="No file provided")
-        
-        # Upload file to S3
-        result = await s3_uploader.upload_file(
-            file=file,
-            bucket_name=settings.s3_bucket_name,
-            folder=folder,
-            validate_pdf=True
-        )
-        
-        return JSONResponse(
-            status_code=200,
-            content=result
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in upload endpoint: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail="Internal server error occurred during file upload"
-        )
+    # Validate that a file was uploaded
+    if not file:
+        raise HTTPException(status_code=400, detail="No file provided")
+    
+    # Upload file to S3
+    result = await s3_uploader.upload_file(
+        file=file,
+        bucket_name=S3_BUCKET,
+        folder=folder,
+        validate_pdf=True
+    )
+    
+    return ORJSONResponse(
+        content=result
+    )
+
+
+@router.post("/pdf/presign")
+async def presign_pdf_upload(
+    filename: str,
+    folder: Optional[str] = "uploads",
+    s3_uploader: S3FileUploader = Depends(get_s3_uploader)
+):
+    """
+    Get a presigned POST form for uploading a PDF directly to S3.
+    
+    For large files the bytes go from the client to S3 without passing
+    through this service. Unlike /upload/pdf, the object's content is not
+    validated at upload: the policy only pins the size range and a
+    Content-Type the client declares, so anything can land under the .pdf
+    key. /upload/extract-medical-data checks the PDF header before using it.
+    
+    Args:
+        filename: Name of the PDF the client will upload
+        folder: Optional folder prefix in S3 (default: "uploads")
+        s3_uploader: S3 uploader dependency
+    
+    Returns:
+        JSON response with the form URL, form fields and file key
+    """
+    if not filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files can be presigned on this endpoint")
+    
+    # Signing (and any credential refresh) is blocking, so keep it off the event loop
+    result = await run_in_threadpool(
+        s3_uploader.create_presigned_upload,
+        bucket_name=S3_BUCKET,
+        original_filename=filename,
+        content_type="application/pdf",
+        max_bytes=MAX_UPLOAD_BYTES,
+        folder=folder
+    )
+    
+    return ORJSONResponse(
+        content=result
+    )
 
 
 @router.post("/file")
@@ -92,40 +137,28 @@ async def upload_file(
     Returns:
         JSON response with upload details
     """
-    try:
-        # Validate that a file was uploaded
-        if not file:
-            raise HTTPException(status_code=400, detail="No file provided")
-        
-        # Upload file to S3 without PDF validation
-        result = await s3_uploader.upload_file(
-            file=file,
-            bucket_name=settings.s3_bucket_name,
-            folder=folder,
-            validate_pdf=False
-        )
-        
-        return JSONResponse(
-            status_code=200,
-            content=result
-        )
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in upload endpoint: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail="Internal server error occurred during file upload"
-        )
+    # Validate that a file was uploaded
+    if not file:
+        raise HTTPException(status_code=400, detail="No file provided")
+    
+    # Upload file to S3 without PDF validation
+    result = await s3_uploader.upload_file(
+        file=file,
+        bucket_name=S3_BUCKET,
+        folder=folder,
+        validate_pdf=False
+    )
+    
+    return ORJSONResponse(
+        content=result
+    )
 
 
 @router.get("/file/{bucket_name}/{file_key:path}")
 async def get_file_url(
     bucket_name: str,
     file_key: str,
-    expiration: Optional[int] = 3600,
+    expiration: Annotated[int, Query(ge=60, le=604800)] = 3600,
     s3_uploader: S3FileUploader = Depends(get_s3_uploader)
 ):
     """
@@ -134,40 +167,67 @@ async def get_file_url(
     Args:
         bucket_name: S3 bucket name
         file_key: S3 file key
-        expiration: URL expiration time in seconds (default: 1 hour)
+        expiration: URL expiration time in seconds, 60s to 7 days (default: 1 hour)
         s3_uploader: S3 uploader dependency
     
     Returns:
         JSON response with presigned URL
     """
-    try:
-        url = s3_uploader.get_file_url(
-            bucket_name=bucket_name,
-            file_key=file_key,
-            expiration=expiration
-        )
-        
-        return {
+    url = await s3_uploader.get_file_url(
+        bucket_name=bucket_name,
+        file_key=file_key,
+        expiration=expiration
+    )
+    
+    # With long-term keys the URL outlives this response by at least the cache margin, so
+    # clients may reuse it that long; private because a presigned URL is a bearer credential
+    return ORJSONResponse(
+        content={
             "success": True,
             "presigned_url": url,
             "expiration_seconds": expiration
-        }
-        
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error in get_file_url endpoint: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail="Internal server error occurred while generating file URL"
-        )
+        },
+        headers={"Cache-Control": f"private, max-age={s3_uploader.url_client_cache_seconds(expiration)}"}
+    )
+
+
+@router.post("/file/{bucket_name}/batch")
+async def get_file_urls_batch(
+    bucket_name: str,
+    batch: PresignedUrlBatchRequest,
+    s3_uploader: S3FileUploader = Depends(get_s3_uploader)
+):
+    """
+    Get presigned URLs for many files in one request.
+    
+    Every key is signed with the same shared client; cache misses are signed
+    concurrently in the threadpool.
+    
+    Args:
+        bucket_name: S3 bucket name
+        batch: Keys to sign and the URL expiration
+        s3_uploader: S3 uploader dependency
+    
+    Returns:
+        JSON response mapping each file key to its presigned URL
+    """
+    urls = await asyncio.gather(
+        *(s3_uploader.get_file_url(bucket_name=bucket_name, file_key=key, expiration=batch.expiration)
+          for key in batch.keys)
+    )
+    
+    return ORJSONResponse(content={
+        "success": True,
+        "presigned_urls": dict(zip(batch.keys, urls)),
+        "expiration_seconds": batch.expiration
+    })
 
 
 @router.post("/extract-medical-data")
 async def extract_medical_data(
     request: dict,
-    s3_uploader: S3FileUploader = Depends(get_s3_uploader)
+    s3_uploader: S3FileUploader = Depends(get_s3_uploader),
+    extractor: AWSTextExtractor = Depends(get_text_extractor)
 ):
     """
     Extract medical data from an uploaded file using AWS services.
@@ -185,19 +245,7 @@ async def extract_medical_data(
         if not file_url:
             raise HTTPException(status_code=400, detail="file_url is required")
         
-        # Import here to avoid circular imports
-        from ..modules.text_extraction import AWSTextExtractor
-        
-        # Initialize text extractor
-        extractor = AWSTextExtractor(
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region,
-            aws_role_arn=settings.aws_role_arn
-        )
-        
         # Parse S3 URL to get bucket and key
-        import re
         s3_pattern = r'https://([^.]+)\.s3\.amazonaws\.com/(.+)'
         match = re.match(s3_pattern, file_url)
         
@@ -207,22 +255,17 @@ async def extract_medical_data(
         bucket_name = match.group(1)
         object_key = match.group(2)
         
-        # Download file from S3 using boto3
-        import boto3
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region
-        )
-        
+        # Download file from S3 using the shared client
         try:
-            s3_response = s3_client.get_object(Bucket=bucket_name, Key=object_key)
-            file_content = s3_response['Body'].read()
+            file_content = await run_in_threadpool(s3_uploader.download_file, bucket_name, object_key)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to download from S3: {str(e)}")
         file_extension = file_name.split('.')[-1].lower() if '.' in file_name else 'txt'
         
+        # Presigned uploads are not content-checked, so verify a .pdf object really is one
+        if (object_key.lower().endswith('.pdf') or file_extension == 'pdf') and not file_content.startswith(PDF_MAGIC_BYTES):
+            raise HTTPException(status_code=400, detail="File is not a valid PDF")
+        
         # Extract text and perform NER
         result = await extractor.extract_and_analyze(
             file=file_content,
@@ -241,7 +284,6 @@ async def extract_medical_data(
         # If it's a JSON file, try to parse structured data directly
         if file_extension == "json":
             try:
-                import json
                 json_data = json.loads(extracted_text)
                 
                 # Extract patient info from JSON structure
@@ -336,7 +378,6 @@ async def extract_medical_data(
                 elif entity_type == "AGE":
                     if "age" not in patient_info:
                         # Extract numeric age
-                        import re
                         age_match = re.search(r'\d+', text)
                         if age_match:
                             patient_info["age"] = age_match.group()
@@ -363,7 +404,6 @@ async def extract_medical_data(
                     pass
             elif "age:" in line_lower or "years old" in line_lower or "y/o" in line_lower:
                 try:
-                    import re
                     # Try different age patterns
                     age_patterns = [
                         r'age:?\s*(\d+)',
@@ -381,7 +421,6 @@ async def extract_medical_data(
                     pass
             elif any(keyword in line_lower for keyword in ["gender:", "sex:", "male", "female", "m/f"]):
                 try:
-                    import re
                     # Try different gender patterns
                     gender_patterns = [
                         r'(?:gender|sex):?\s*(male|female|m|f)',
@@ -404,7 +443,6 @@ async def extract_medical_data(
                     pass
             elif "weight:" in line_lower or "wt:" in line_lower or "kg" in line_lower or "lbs" in line_lower:
                 try:
-                    import re
                     # Try different weight patterns
                     weight_patterns = [
                         r'weight:?\s*(\d+(?:\.\d+)?)\s*(kg|lbs?|pounds?)',
@@ -471,8 +509,6 @@ async def extract_medical_data(
                     pass
         
         # Additional full-text pattern matching for demographics
-        import re
-        
         # If we haven't found age yet, try more patterns
         if "age" not in patient_info:
             age_patterns = [
@@ -585,7 +621,7 @@ async def extract_medical_data(
             "raw_extraction": result
         }
                     
-        logger.info(f"Successfully extracted medical data from {file_name}")
+        logger.info("Successfully extracted medical data from %s", file_name)
         
         return {
             "success": True,
@@ -593,15 +629,18 @@ async def extract_medical_data(
             "data": medical_data
         }
         
+    except HTTPException:
+        # Re-raise request errors (bad URL, failed download, not a PDF) unchanged
+        raise
     except ClientError as e:
-        logger.error(f"S3 access error: {str(e)}")
+        logger.error("S3 access error: %s", e)
         raise HTTPException(
             status_code=400,
             detail=f"Failed to access S3 file: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Error extracting medical data: {str(e)}")
+        logger.error("Error extracting medical data: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to extract medical data: {str(e)}"
-        )
\ No newline at end of file
+        )
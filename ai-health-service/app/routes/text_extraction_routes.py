@@ -5,8 +5,9 @@ This module contains endpoints for text extraction and NER analysis
 from various file types using AWS services.
 """
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Form, Request
+from fastapi.responses import ORJSONResponse
+import boto3
 import logging
 from typing import Optional, Dict, Any
 import mimetypes
@@ -20,18 +21,26 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/extract", tags=["Text Extraction & NER"])
 
 
-def get_text_extractor() -> AWSTextExtractor:
+def create_text_extractor(session: Optional[boto3.Session] = None) -> AWSTextExtractor:
     """
-    Dependency to get AWS Text Extractor instance.
+    Build the AWS Text Extractor shared by all requests (called once at startup).
     """
     return AWSTextExtractor(
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
         region_name=settings.aws_region,
-        aws_role_arn=settings.aws_role_arn
+        aws_role_arn=settings.aws_role_arn,
+        session=session
     )
 
 
+def get_text_extractor(request: Request) -> AWSTextExtractor:
+    """
+    Dependency to get the AWS Text Extractor instance created at startup.
+    """
+    return request.app.state.text_extractor
+
+
 def get_file_type(file: UploadFile) -> str:
     """
     Determine file type from filename or content type.
@@ -103,7 +112,7 @@ async def extract_text_and_ner(
                 detail="File size too large. Maximum size is 10MB."
             )
         
-        logger.info(f"Processing file: {file.filename}, type: {file_type}, size: {file_size} bytes")
+        logger.info("Processing file: %s, type: %s, size: %s bytes", file.filename, file_type, file_size)
         
         # Extract text and perform NER using the content bytes
         result = await extractor.extract_and_analyze(
@@ -119,10 +128,9 @@ async def extract_text_and_ner(
             "content_type": file.content_type
         })
         
-        logger.info(f"Successfully processed {file.filename}")
+        logger.info("Successfully processed %s", file.filename)
         
-        return JSONResponse(
-            status_code=200,
+        return ORJSONResponse(
             content={
                 "success": True,
                 "message": "Text extraction and analysis completed successfully",
@@ -133,7 +141,7 @@ async def extract_text_and_ner(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing file {file.filename}: {str(e)}")
+        logger.error("Error processing file %s: %s", file.filename, e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to process file: {str(e)}"
@@ -172,7 +180,7 @@ async def extract_text_only(
                 detail="File size too large. Maximum size is 10MB."
             )
         
-        logger.info(f"Extracting text from: {file.filename}, type: {file_type}")
+        logger.info("Extracting text from: %s, type: %s", file.filename, file_type)
         
         # Extract text only using the content bytes
         result = await extractor.extract_and_analyze(
@@ -188,10 +196,9 @@ async def extract_text_only(
             "content_type": file.content_type
         })
         
-        logger.info(f"Successfully extracted text from {file.filename}")
+        logger.info("Successfully extracted text from %s", file.filename)
         
-        return JSONResponse(
-            status_code=200,
+        return ORJSONResponse(
             content={
                 "success": True,
                 "message": "Text extraction completed successfully",
@@ -202,7 +209,7 @@ async def extract_text_only(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error extracting text from {file.filename}: {str(e)}")
+        logger.error("Error extracting text from %s: %s", file.filename, e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to extract text: {str(e)}"
@@ -234,7 +241,7 @@ async def analyze_ner_only(
                 detail="Text too long. Maximum length is 20,000 characters."
             )
         
-        logger.info(f"Performing NER analysis on text (length: {len(text)} chars)")
+        logger.info("Performing NER analysis on text (length: %s chars)", len(text))
         
         # Perform NER analysis
         ner_results = await extractor._perform_ner(text)
@@ -246,8 +253,7 @@ async def analyze_ner_only(
         
         logger.info("NER analysis completed successfully")
         
-        return JSONResponse(
-            status_code=200,
+        return ORJSONResponse(
             content={
                 "success": True,
                 "message": "NER analysis completed successfully",
@@ -258,7 +264,7 @@ async def analyze_ner_only(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in NER analysis: {str(e)}")
+        logger.error("Error in NER analysis: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"NER analysis failed: {str(e)}"
@@ -273,8 +279,7 @@ async def get_supported_formats():
     Returns:
         JSON response with supported formats
     """
-    return JSONResponse(
-        status_code=200,
+    return ORJSONResponse(
         content={
             "success": True,
             "message": "Supported file formats",
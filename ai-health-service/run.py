@@ -3,6 +3,7 @@
 Startup script for AI Health Service
 """
 
+import os
 import uvicorn
 from app.main import app
 from app.config import settings
@@ -13,5 +14,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        # --reload and multiple workers are mutually exclusive
+        workers=None if settings.debug else (os.cpu_count() or 1),
+        access_log=settings.debug,
         log_level="info" if not settings.debug else "debug"
     )
\ No newline at end of file
@@ -10,6 +10,14 @@ from app.main import app
 
 client = TestClient(app)
 
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Run the app lifespan so shared AWS clients are available"""
+    with client:
+        yield
+
+
 class TestHealthCheck:
     """Test health check endpoints"""
     
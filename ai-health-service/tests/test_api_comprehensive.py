@@ -4,12 +4,73 @@ Tests both file upload and care plan functionality
 """
 
 import pytest
+import base64
 import json
+import logging
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+from unittest import mock
 from fastapi.testclient import TestClient
-from app.main import app
+from app.config import BEDROCK_MODEL_ID, FAST_MODEL_ID, MAX_UPLOAD_BYTES, NOVA_MICRO_MODEL_ID, S3_BUCKET
+from app.main import app, ContentLengthLimitMiddleware, UnhandledErrorMiddleware
+from app.modules.care_plan import BedrockCarePlanGenerator, model_family
+from app.modules.file_upload import S3FileUploader
+from app.routes.care_plan_routes import get_care_plan_generator
+from app.routes.s3_routes import get_s3_uploader
 
 client = TestClient(app)
 
+SAMPLE_PRESCRIPTION = {
+    "patient_info": {"age": 45, "gender": "Female", "medical_conditions": ["Hypertension"]},
+    "diagnosis": "Acute bronchitis",
+    "prescriptions": [
+        {"medication_name": "Azithromycin", "dosage": "500mg daily", "duration": "5 days"}
+    ]
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app_lifespan():
+    """Run the app lifespan so shared AWS clients are available"""
+    with client:
+        yield
+
+
+PLAN_JSON = json.dumps({
+    "patient_summary": "Adult with acute bronchitis",
+    "care_goals": ["Resolve infection"],
+    "medication_management": [{"title": "Azithromycin", "content": "500mg daily", "priority": "high"}],
+    "lifestyle_recommendations": [],
+    "monitoring_schedule": [],
+    "warning_signs": ["Shortness of breath"],
+    "follow_up_recommendations": []
+})
+
+
+def stub_invoke_model(fail_when):
+    """
+    Stand-in for BedrockCarePlanGenerator._invoke_model that answers in each
+    model family's response format, or raises AccessDeniedException when
+    fail_when(model_id, body) is true.
+    """
+    def invoke_model(model_id, body):
+        if fail_when(model_id, body):
+            raise ClientError({"Error": {"Code": "AccessDeniedException", "Message": "denied"}}, "InvokeModel")
+        if model_family(model_id) == "amazon.nova":
+            return {"output": {"message": {"content": [{"text": PLAN_JSON}]}}}
+        return {"content": [{"text": PLAN_JSON}]}
+    return invoke_model
+
+
+@pytest.fixture
+def care_plan_generator():
+    """Fresh generator (empty care plan cache) with static test credentials"""
+    generator = BedrockCarePlanGenerator(aws_access_key_id="testing", aws_secret_access_key="testing")
+    app.dependency_overrides[get_care_plan_generator] = lambda: generator
+    yield generator
+    app.dependency_overrides.pop(get_care_plan_generator, None)
+
+
 class TestHealthCheck:
     """Test health check endpoints"""
     
@@ -21,6 +82,12 @@ class TestHealthCheck:
         assert data["status"] == "healthy"
         assert "timestamp" in data
 
+    def test_liveness(self):
+        """Test plain-text liveness probe endpoint"""
+        response = client.get("/livez")
+        assert response.status_code == 200
+        assert response.text == "ok"
+
 class TestFileUpload:
     """Test file upload functionality"""
     
@@ -36,6 +103,88 @@ class TestFileUpload:
         # Should return 422 (validation error) since no file provided
         assert response.status_code == 422
 
+    def test_oversize_body_rejected(self):
+        """Test that bodies over the declared limit get 413 before the handler runs"""
+        async def echo_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        limited_client = TestClient(ContentLengthLimitMiddleware(echo_app, max_body_bytes=10))
+        assert limited_client.post("/", content=b"x" * 11).status_code == 413
+        assert limited_client.post("/", content=b"x" * 10).status_code == 200
+
+class TestPresignedUrls:
+    """Test presigned URL endpoints (signed locally, no S3 call)"""
+    
+    @pytest.fixture(autouse=True)
+    def offline_s3_uploader(self):
+        """Sign with static test credentials instead of the configured ones"""
+        uploader = S3FileUploader(aws_access_key_id="testing", aws_secret_access_key="testing")
+        app.dependency_overrides[get_s3_uploader] = lambda: uploader
+        yield uploader
+        app.dependency_overrides.pop(get_s3_uploader, None)
+    
+    def test_file_url(self):
+        """Test presigned GET URL under the /upload prefix"""
+        response = client.get("/upload/file/test-bucket/reports/a b.pdf", params={"expiration": 600})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["expiration_seconds"] == 600
+        assert "test-bucket" in data["presigned_url"]
+        assert "reports/a%20b.pdf" in data["presigned_url"]
+        assert response.headers["cache-control"] == "private, max-age=300"
+    
+    def test_file_url_expiration_validation(self):
+        """Test that out-of-range expirations get FastAPI's validation error"""
+        response = client.get("/upload/file/test-bucket/a.pdf", params={"expiration": 10})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["query", "expiration"]
+    
+    def test_presigned_pdf_upload(self):
+        """Test presigned POST form for direct PDF uploads"""
+        response = client.post("/upload/pdf/presign", params={"filename": "scan.pdf"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["url"] == f"https://{S3_BUCKET}.s3.amazonaws.com/"
+        assert data["file_key"].startswith("uploads/") and data["file_key"].endswith(".pdf")
+        assert data["fields"]["key"] == data["file_key"]
+        assert data["fields"]["Content-Type"] == "application/pdf"
+        
+        policy = json.loads(base64.b64decode(data["fields"]["policy"]))
+        assert ["content-length-range", 1, MAX_UPLOAD_BYTES] in policy["conditions"]
+        
+        response = client.post("/upload/pdf/presign", params={"filename": "notes.txt"})
+        assert response.status_code == 400
+    
+    def test_file_urls_batch(self):
+        """Test presigning several keys in one request"""
+        keys = ["reports/a.pdf", "reports/b.pdf", "scans/c.pdf"]
+        response = client.post("/upload/file/test-bucket/batch", json={"keys": keys, "expiration": 900})
+        assert response.status_code == 200
+        data = response.json()
+        assert list(data["presigned_urls"]) == keys
+        assert all(key in url for key, url in data["presigned_urls"].items())
+        assert data["expiration_seconds"] == 900
+        
+        response = client.post("/upload/file/test-bucket/batch", json={"keys": []})
+        assert response.status_code == 422
+    
+    def test_presigned_pdf_checked_before_extraction(self, offline_s3_uploader):
+        """Test that a non-PDF object under a .pdf key is rejected when consumed"""
+        with mock.patch.object(offline_s3_uploader, "download_file", return_value=b"<html>not a pdf</html>") as download:
+            response = client.post("/upload/extract-medical-data", json={
+                "file_url": f"https://{S3_BUCKET}.s3.amazonaws.com/uploads/20250101_000000_abcd1234.pdf",
+                "file_name": "scan.pdf"
+            })
+        assert response.status_code == 400
+        assert response.json()["detail"] == "File is not a valid PDF"
+        download.assert_called_once_with(S3_BUCKET, "uploads/20250101_000000_abcd1234.pdf")
+    
+    def test_file_url_in_openapi(self):
+        """Test that the presigned GET URL route is documented"""
+        paths = client.get("/openapi.json").json()["paths"]
+        assert "/upload/file/{bucket_name}/{file_key}" in paths
+
 class TestCarePlan:
     """Test care plan functionality"""
     
@@ -157,6 +306,138 @@ class TestCarePlan:
             data = response.json()
             assert "care_plan" in data
 
+class TestErrorHandling:
+    """Test how AWS and unexpected errors reach the client"""
+    
+    @pytest.fixture
+    def bedrock_stub(self, care_plan_generator):
+        """Bedrock runtime calls answered by a stubber"""
+        with Stubber(care_plan_generator.bedrock_client) as stubber:
+            yield stubber
+    
+    def test_bedrock_access_denied(self, bedrock_stub):
+        """Test that Bedrock AccessDeniedException becomes a 403 with a useful detail"""
+        bedrock_stub.add_client_error("invoke_model", service_error_code="AccessDeniedException", http_status_code=403)
+        response = client.post("/care-plan/claude-37-sonnet", json=SAMPLE_PRESCRIPTION)
+        assert response.status_code == 403
+        assert "Access denied to Amazon Bedrock" in response.json()["detail"]
+    
+    def test_bedrock_validation_error(self, bedrock_stub):
+        """Test that Bedrock ValidationException becomes a 502"""
+        bedrock_stub.add_client_error("invoke_model", service_error_code="ValidationException", http_status_code=400)
+        response = client.post("/care-plan/nova-micro", json=SAMPLE_PRESCRIPTION)
+        assert response.status_code == 502
+        assert "Invalid request to Bedrock" in response.json()["detail"]
+    
+    def test_unhandled_error_logged_once(self, caplog):
+        """Test that unexpected errors become a JSON 500 and are logged exactly once"""
+        async def failing_app(scope, receive, send):
+            raise RuntimeError("boom")
+        
+        error_client = TestClient(UnhandledErrorMiddleware(failing_app))
+        with caplog.at_level(logging.ERROR):
+            response = error_client.get("/anything")
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+        error_records = [record for record in caplog.records if record.exc_info]
+        assert len(error_records) == 1
+
+class TestMultiPlanEndpoints:
+    """Test /compare, /batch and /auto with Bedrock stubbed"""
+    
+    def test_compare_partial_failure(self, care_plan_generator):
+        """Test that one failing model is reported without failing the request"""
+        with mock.patch.object(care_plan_generator, "_invoke_model",
+                               side_effect=stub_invoke_model(lambda model_id, body: model_id == NOVA_MICRO_MODEL_ID)):
+            response = client.post("/care-plan/compare", json=SAMPLE_PRESCRIPTION)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is False
+        assert data["successful_models"] == data["total_models"] - 1
+        assert data["results"]["nova_micro"]["success"] is False
+        assert "Access denied to Amazon Bedrock" in data["results"]["nova_micro"]["error"]
+        assert data["results"]["claude_3_7_sonnet"]["care_plan"]["care_goals"] == ["Resolve infection"]
+    
+    def test_compare_all_fail(self, care_plan_generator):
+        """Test that the comparison is a 500 only when every model fails"""
+        with mock.patch.object(care_plan_generator, "_invoke_model",
+                               side_effect=stub_invoke_model(lambda model_id, body: True)):
+            response = client.post("/care-plan/compare", json=SAMPLE_PRESCRIPTION)
+        assert response.status_code == 500
+        assert response.json()["successful_models"] == 0
+    
+    def test_batch_partial_failure(self, care_plan_generator):
+        """Test that results keep request order and one failure doesn't fail the batch"""
+        prescriptions = [
+            SAMPLE_PRESCRIPTION,
+            {**SAMPLE_PRESCRIPTION, "diagnosis": "Unreachable diagnosis"},
+            {**SAMPLE_PRESCRIPTION, "diagnosis": "Sinusitis"}
+        ]
+        with mock.patch.object(care_plan_generator, "_invoke_model",
+                               side_effect=stub_invoke_model(lambda model_id, body: b"Unreachable" in body)):
+            response = client.post("/care-plan/batch", json={"prescriptions": prescriptions})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["model_used"] == BEDROCK_MODEL_ID
+        assert data["successful_plans"] == 2
+        assert [result["success"] for result in data["results"]] == [True, False, True]
+    
+    def test_batch_all_fail(self, care_plan_generator):
+        """Test that the batch is a 500 only when every plan fails"""
+        with mock.patch.object(care_plan_generator, "_invoke_model",
+                               side_effect=stub_invoke_model(lambda model_id, body: True)):
+            response = client.post("/care-plan/batch", json={"prescriptions": [SAMPLE_PRESCRIPTION]})
+        assert response.status_code == 500
+        assert response.json()["successful_plans"] == 0
+    
+    def test_batch_size_limit(self):
+        """Test that batches over eight prescriptions are rejected"""
+        response = client.post("/care-plan/batch", json={"prescriptions": [SAMPLE_PRESCRIPTION] * 9})
+        assert response.status_code == 422
+    
+    def test_auto_model_selection(self, care_plan_generator):
+        """Test that simple prescriptions use the fast model and complex ones the default"""
+        simple = {**SAMPLE_PRESCRIPTION, "patient_info": {"age": 30, "gender": "Male"}}
+        with mock.patch.object(care_plan_generator, "_invoke_model",
+                               side_effect=stub_invoke_model(lambda model_id, body: False)) as invoke:
+            simple_response = client.post("/care-plan/auto", json=simple)
+            complex_response = client.post("/care-plan/auto", json=SAMPLE_PRESCRIPTION)
+        assert simple_response.json()["model_used"] == FAST_MODEL_ID
+        assert complex_response.json()["model_used"] == BEDROCK_MODEL_ID
+        assert [call.args[0] for call in invoke.call_args_list] == [FAST_MODEL_ID, BEDROCK_MODEL_ID]
+
+class TestCarePlanStream:
+    """Test streamed care plan generation (Bedrock stream stubbed)"""
+    
+    def test_stream_care_plan(self, care_plan_generator):
+        """Test that streamed text arrives in order and uncompressed"""
+        with mock.patch.object(care_plan_generator, "_invoke_model_stream", return_value=iter(['{"patient_summary": ', '"ok"}'])):
+            response = client.post("/care-plan/claude-37-sonnet/stream", json=SAMPLE_PRESCRIPTION)
+        assert response.status_code == 200
+        assert response.text == '{"patient_summary": "ok"}'
+        assert response.headers["content-encoding"] == "identity"
+        assert response.headers["content-type"].startswith("text/plain")
+    
+    @pytest.mark.parametrize("error_code, status_code", [
+        ("AccessDeniedException", 403),
+        ("ValidationException", 502),
+        ("ThrottlingException", 502),
+    ])
+    def test_stream_bedrock_errors(self, care_plan_generator, error_code, status_code):
+        """Test that Bedrock errors before the first chunk get the same statuses as /claude-37-sonnet"""
+        with Stubber(care_plan_generator.bedrock_client) as stubber:
+            stubber.add_client_error("invoke_model_with_response_stream", service_error_code=error_code, http_status_code=400)
+            response = client.post("/care-plan/claude-37-sonnet/stream", json=SAMPLE_PRESCRIPTION)
+        assert response.status_code == status_code
+        assert "Bedrock" in response.json()["detail"]
+    
+    def test_empty_stream(self, care_plan_generator):
+        """Test that a stream with no text becomes a 502 instead of an unhandled error"""
+        with mock.patch.object(care_plan_generator, "_invoke_model_stream", return_value=iter([])):
+            response = client.post("/care-plan/claude-37-sonnet/stream", json=SAMPLE_PRESCRIPTION)
+        assert response.status_code == 502
+        assert "empty care plan stream" in response.json()["detail"]
+
 class TestAPIDocs:
     """Test API documentation endpoints"""
     
@@ -182,6 +463,18 @@ class TestCORS:
         response = client.get("/health")
         assert response.status_code == 200
         # CORS headers should be present for browser compatibility
+    
+    def test_cors_allowed_origin(self):
+        """Test that configured origins are echoed back on preflight"""
+        response = client.options(
+            "/health",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "GET"
+            }
+        )
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
 
 if __name__ == "__main__":
     # Run tests with verbose output
@@ -0,0 +1,49 @@
+"""
+AWS Session Tests
+Checks that assumed-role sessions refresh their credentials through STS
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from botocore.credentials import AssumeRoleCredentialFetcher
+
+from app.modules.aws_session import assume_role_session
+
+
+def sts_response(access_key: str, expires_in: timedelta) -> dict:
+    """Build an AssumeRole response expiring after expires_in"""
+    return {
+        "Credentials": {
+            "AccessKeyId": access_key,
+            "SecretAccessKey": "secret",
+            "SessionToken": "token",
+            "Expiration": datetime.now(timezone.utc) + expires_in
+        }
+    }
+
+
+class TestAssumeRoleSession:
+    """Test refreshing assumed-role credentials"""
+
+    def test_credentials_refresh_before_expiry(self):
+        """Test that credentials are fetched on first use and renewed near expiry"""
+        responses = [
+            sts_response("FIRST", timedelta(minutes=1)),
+            sts_response("SECOND", timedelta(hours=1)),
+        ]
+        with mock.patch.object(AssumeRoleCredentialFetcher, "_get_credentials", side_effect=responses) as assume_role:
+            session = assume_role_session(
+                aws_role_arn="arn:aws:iam::123456789012:role/test",
+                aws_access_key_id="testing",
+                aws_secret_access_key="testing"
+            )
+            credentials = session.get_credentials()
+            assert credentials.method == "sts-assume-role"
+            assert assume_role.call_count == 0
+
+            assert credentials.get_frozen_credentials().access_key == "FIRST"
+            # Inside the mandatory refresh window, so the next read renews
+            assert credentials.get_frozen_credentials().access_key == "SECOND"
+            assert credentials.get_frozen_credentials().access_key == "SECOND"
+            assert assume_role.call_count == 2
@@ -0,0 +1,216 @@
+"""
+Care Plan Generator Tests
+Tests model routing and request building without calling Bedrock
+"""
+
+import json
+from unittest import mock
+
+import orjson
+import pytest
+
+from app.modules.care_plan import (
+    CARE_PLAN_MAX_TOKENS,
+    BedrockCarePlanGenerator,
+    CarePlanSection,
+    DoctorPrescription,
+    Priority,
+    get_model_adapter,
+    model_family,
+)
+
+PRESCRIPTION = DoctorPrescription(
+    patient_info={"age": 45, "gender": "Female", "medical_conditions": ["Hypertension"]},
+    diagnosis="Acute bronchitis",
+    prescriptions=[
+        {"medication_name": "Azithromycin", "dosage": "500mg daily", "duration": "5 days"}
+    ]
+)
+
+PLAN_JSON = json.dumps({
+    "patient_summary": "Adult with acute bronchitis",
+    "care_goals": ["Resolve infection"],
+    "medication_management": [{"title": "Azithromycin", "content": "500mg daily", "priority": "High"}],
+    "lifestyle_recommendations": [],
+    "monitoring_schedule": [],
+    "warning_signs": ["Shortness of breath"],
+    "follow_up_recommendations": []
+})
+
+
+@pytest.fixture
+def generator():
+    """Generator with static test credentials (no AWS calls are made)"""
+    return BedrockCarePlanGenerator(aws_access_key_id="testing", aws_secret_access_key="testing")
+
+
+class TestModelFamily:
+    """Test reducing model identifiers to their family"""
+
+    @pytest.mark.parametrize("model_id, family", [
+        ("amazon.nova-micro-v1:0", "amazon.nova"),
+        ("amazon.titan-text-express-v1", "amazon.titan"),
+        ("anthropic.claude-3-sonnet-20240229-v1:0", "anthropic.claude"),
+        ("us.anthropic.claude-3-7-sonnet-20250219-v1:0", "anthropic.claude"),
+        ("eu.amazon.nova-micro-v1:0", "amazon.nova"),
+        ("arn:aws:bedrock:us-east-1::foundation-model/amazon.nova-micro-v1:0", "amazon.nova"),
+        ("arn:aws:bedrock:us-east-1:123456789012:inference-profile/us.amazon.nova-pro-v1:0", "amazon.nova"),
+        ("arn:aws:bedrock:us-east-1:123456789012:application-inference-profile/a1b2c3", ""),
+    ])
+    def test_model_family(self, model_id, family):
+        """Test bare ids, inference profile ids and ARNs"""
+        assert model_family(model_id) == family
+
+    def test_arn_uses_family_adapter(self):
+        """Test that a Nova foundation model ARN gets the Nova request format"""
+        adapter = get_model_adapter("arn:aws:bedrock:us-east-1::foundation-model/amazon.nova-micro-v1:0")
+        assert adapter.name == "Nova"
+
+
+class TestSectionPriority:
+    """Test normalizing section priorities from model output"""
+
+    @pytest.mark.parametrize("level, priority", [
+        ("high", Priority.HIGH),
+        (" Medium ", Priority.MEDIUM),
+        ("LOW", Priority.LOW),
+        ("Critical", Priority.HIGH),
+        ("urgent", Priority.HIGH),
+        ("Severe", Priority.HIGH),
+        ("moderate", Priority.MEDIUM),
+        ("top", Priority.HIGH),
+    ])
+    def test_priority(self, level, priority):
+        """Test case-insensitive levels, urgency aliases and unknown levels"""
+        section = CarePlanSection(title="Check", content="Monitor", priority=level)
+        assert section.priority is priority
+
+    def test_priority_serializes_lowercase(self):
+        """Test that model casing like "High" is dumped as the enum value"""
+        section = CarePlanSection(title="Check", content="Monitor", priority="High")
+        assert section.model_dump(mode="json")["priority"] == "high"
+
+
+class TestFallbackCarePlan:
+    """Test the care plan used when model output can't be parsed"""
+
+    def test_fallback_plans_are_independent(self, generator):
+        """Test that mutating one fallback plan leaves later ones unchanged"""
+        first = generator._create_fallback_care_plan(PRESCRIPTION, "not json")
+        first.warning_signs.append("Changed")
+        first.lifestyle_recommendations[0].content = "Changed"
+
+        second = generator._create_fallback_care_plan(PRESCRIPTION, "not json")
+        assert "Changed" not in second.warning_signs
+        assert second.lifestyle_recommendations[0].content != "Changed"
+        assert second.model_dump()["care_goals"] == list(BedrockCarePlanGenerator._FALLBACK_CARE_GOALS)
+
+
+class TestLatencyOptimized:
+    """Test which models get performanceConfigLatency"""
+
+    def test_supported_model(self):
+        """Test that allow-listed models (also as ARNs) get optimized latency"""
+        generator = BedrockCarePlanGenerator(
+            aws_access_key_id="testing", aws_secret_access_key="testing",
+            performance_config={"latency": "optimized"}
+        )
+        assert generator._performance_kwargs("us.anthropic.claude-3-5-haiku-20241022-v1:0") == {
+            "performanceConfigLatency": "optimized"
+        }
+        assert generator._performance_kwargs(
+            "arn:aws:bedrock:us-east-2:123456789012:inference-profile/us.anthropic.claude-3-5-haiku-20241022-v1:0"
+        ) == {"performanceConfigLatency": "optimized"}
+
+    def test_unsupported_model(self):
+        """Test that models without latency-optimized inference use standard latency"""
+        generator = BedrockCarePlanGenerator(
+            aws_access_key_id="testing", aws_secret_access_key="testing",
+            performance_config={"latency": "optimized"}
+        )
+        assert generator._performance_kwargs("us.anthropic.claude-3-7-sonnet-20250219-v1:0") == {}
+        assert generator._performance_kwargs("amazon.nova-micro-v1:0") == {}
+
+
+class TestRequestBodies:
+    """Test the request body each model family receives"""
+
+    PATIENT_SECTION = 'PATIENT: "quoted" notes\nsecond line'
+
+    def encode(self, generator, model_id):
+        """Encode a body for model_id and decode it back"""
+        return orjson.loads(generator._encode_request_body(model_id, self.PATIENT_SECTION))
+
+    def test_claude_with_prompt_caching(self, generator):
+        """Test that cache-capable Claude models get a cacheable system prompt"""
+        body = self.encode(generator, "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
+        assert body["max_tokens"] == CARE_PLAN_MAX_TOKENS
+        assert body["system"][0]["text"] == generator._PROMPT_INSTRUCTIONS
+        assert body["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert body["messages"][0]["content"][0]["text"] == self.PATIENT_SECTION
+
+    def test_claude_without_prompt_caching(self, generator):
+        """Test that older Claude models get a plain system prompt"""
+        body = self.encode(generator, "anthropic.claude-3-sonnet-20240229-v1:0")
+        assert body["system"] == generator._PROMPT_INSTRUCTIONS
+        assert body["messages"][0]["content"][0]["text"] == self.PATIENT_SECTION
+
+    def test_nova(self, generator):
+        """Test the Nova messages format"""
+        body = self.encode(generator, "amazon.nova-micro-v1:0")
+        assert body["messages"][0]["content"][0]["text"] == generator._PROMPT_INSTRUCTIONS + self.PATIENT_SECTION
+        assert body["inferenceConfig"]["max_new_tokens"] == CARE_PLAN_MAX_TOKENS
+
+    def test_titan(self, generator):
+        """Test the Titan text format"""
+        body = self.encode(generator, "amazon.titan-text-express-v1")
+        assert body["inputText"] == generator._PROMPT_INSTRUCTIONS + self.PATIENT_SECTION
+        assert body["textGenerationConfig"]["maxTokenCount"] == CARE_PLAN_MAX_TOKENS
+
+    def test_unknown_family(self, generator):
+        """Test that unrecognized models get the default Claude-style body"""
+        body = self.encode(generator, "example.model-v1:0")
+        assert body["messages"][0]["content"] == generator._PROMPT_INSTRUCTIONS + self.PATIENT_SECTION
+        assert "system" not in body
+
+
+class TestCarePlanCache:
+    """Test reuse of generated care plans for identical prescriptions"""
+
+    MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
+    async def test_cache_hit(self, generator):
+        """Test that an identical prescription is answered without calling Bedrock again"""
+        with mock.patch.object(generator, "_invoke_model", return_value={"content": [{"text": PLAN_JSON}]}) as invoke:
+            first = await generator.generate_care_plan(PRESCRIPTION, self.MODEL_ID)
+            second = await generator.generate_care_plan(PRESCRIPTION.model_copy(), self.MODEL_ID)
+        assert invoke.call_count == 1
+        assert second == first
+        assert first.medication_management[0].priority == "high"
+
+    async def test_cache_miss(self, generator):
+        """Test that a different prescription or model is generated again"""
+        other = PRESCRIPTION.model_copy(update={"diagnosis": "Pneumonia"})
+        with mock.patch.object(generator, "_invoke_model", return_value={"content": [{"text": PLAN_JSON}]}) as invoke:
+            await generator.generate_care_plan(PRESCRIPTION, self.MODEL_ID)
+            await generator.generate_care_plan(other, self.MODEL_ID)
+            await generator.generate_care_plan(PRESCRIPTION, "us.anthropic.claude-3-5-haiku-20241022-v1:0")
+        assert invoke.call_count == 3
+
+    async def test_fallback_not_cached(self, generator):
+        """Test that unparseable output falls back and is retried next time"""
+        with mock.patch.object(generator, "_invoke_model", return_value={"content": [{"text": "Sorry, no JSON"}]}) as invoke:
+            plan = await generator.generate_care_plan(PRESCRIPTION, self.MODEL_ID)
+            await generator.generate_care_plan(PRESCRIPTION, self.MODEL_ID)
+        assert plan.care_goals == list(BedrockCarePlanGenerator._FALLBACK_CARE_GOALS)
+        assert invoke.call_count == 2
+
+    async def test_cache_disabled(self):
+        """Test that a zero TTL turns the cache off"""
+        generator = BedrockCarePlanGenerator(
+            aws_access_key_id="testing", aws_secret_access_key="testing", care_plan_cache_ttl=0
+        )
+        with mock.patch.object(generator, "_invoke_model", return_value={"content": [{"text": PLAN_JSON}]}) as invoke:
+            await generator.generate_care_plan(PRESCRIPTION, self.MODEL_ID)
+            await generator.generate_care_plan(PRESCRIPTION, self.MODEL_ID)
+        assert invoke.call_count == 2
@@ -0,0 +1,73 @@
+"""
+File Upload Tests
+Tests presigned URL caching without calling S3
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import boto3
+from botocore.credentials import AssumeRoleCredentialFetcher
+
+from app.modules.aws_session import assume_role_session
+from app.modules.file_upload import S3FileUploader
+
+
+def count_signing(uploader: S3FileUploader) -> mock.MagicMock:
+    """Spy on the uploader's URL signing calls"""
+    return mock.patch.object(
+        uploader.s3_client, "generate_presigned_url", wraps=uploader.s3_client.generate_presigned_url
+    )
+
+
+class TestPresignedUrlCache:
+    """Test which presigned URLs are reused"""
+
+    async def test_long_term_keys_cached(self):
+        """Test that URLs signed with access keys are served from the cache"""
+        uploader = S3FileUploader(aws_access_key_id="testing", aws_secret_access_key="testing")
+        with count_signing(uploader) as sign:
+            first = await uploader.get_file_url("test-bucket", "a.pdf", expiration=3600)
+            second = await uploader.get_file_url("test-bucket", "a.pdf", expiration=3600)
+        assert first == second
+        assert sign.call_count == 1
+        assert uploader.url_client_cache_seconds(3600) == 300
+
+    async def test_session_token_not_cached(self):
+        """Test that URLs signed with temporary keys are signed every time"""
+        session = boto3.Session(
+            aws_access_key_id="testing",
+            aws_secret_access_key="testing",
+            aws_session_token="token",
+            region_name="us-east-1"
+        )
+        uploader = S3FileUploader(session=session)
+        with count_signing(uploader) as sign:
+            await uploader.get_file_url("test-bucket", "a.pdf")
+            await uploader.get_file_url("test-bucket", "a.pdf")
+        assert sign.call_count == 2
+        assert uploader.url_client_cache_seconds(3600) == 0
+
+    async def test_expiring_credentials_not_cached(self):
+        """Test that URLs signed with refreshable role credentials are never cached"""
+        response = {
+            "Credentials": {
+                "AccessKeyId": "ROLE",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": datetime.now(timezone.utc) + timedelta(minutes=20)
+            }
+        }
+        with mock.patch.object(AssumeRoleCredentialFetcher, "_get_credentials", return_value=response):
+            session = assume_role_session(
+                aws_role_arn="arn:aws:iam::123456789012:role/test",
+                aws_access_key_id="testing",
+                aws_secret_access_key="testing"
+            )
+            uploader = S3FileUploader(session=session)
+            with count_signing(uploader) as sign:
+                url = await uploader.get_file_url("test-bucket", "a.pdf", expiration=604800)
+                await uploader.get_file_url("test-bucket", "a.pdf", expiration=604800)
+        assert "ROLE" in url
+        assert sign.call_count == 2
+        assert uploader.url_client_cache_seconds(604800) == 0